@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+import argparse
+import math
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent / "skills"
+sys.path.insert(0, str(SKILLS_ROOT))
+
+from docscan.kotlin_lexer import strip_kotlin_comments
+
+# The regex pair the extractor used before the lexer, kept here as the reference.
+LEGACY_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+LEGACY_LINE_COMMENT_RE = re.compile(r"//.*?$", re.MULTILINE)
+# Above this log-log slope the cost is no longer treated as linear in the input size.
+MAX_LINEAR_SLOPE = 1.3
+# On ordinary sources the lexer may cost at most this many times the regex pair.
+MAX_LEGACY_RATIO = 5.0
+MIN_SECONDS = 0.05
+REALISTIC_REPEAT = 5
+# One ordinary Kotlin file: KDoc, line and block comments, plain strings,
+# templates, escapes, a URL and a character literal.
+REALISTIC_UNIT = """package app.feature.login
+
+import androidx.compose.runtime.Composable
+import kotlinx.coroutines.flow.MutableStateFlow
+
+/**
+ * Login screen state holder.
+ * Emits [LoginUiState] updates for the screen.
+ */
+class LoginViewModel(private val repository: AuthRepository) : ViewModel() {
+    private val state = MutableStateFlow<LoginUiState>(LoginUiState.Idle) // current state
+    private val separator = ','
+
+    fun submit(user: String, password: String) {
+        // Trim before validating.
+        val name = user.trim()
+        if (name.isEmpty()) {
+            state.value = LoginUiState.Error("User name is required")
+            return
+        }
+        log("Submitting login for $name with ${password.length} chars")
+        val url = "https://api.example.com/v1/login?user=${encode(name)}&lang=es"
+        state.value = LoginUiState.Loading /* until the request returns */
+        repository.login(url, mapOf("user" to name, "client" to "android")).also { result ->
+            state.value = if (result.ok) LoginUiState.Success(result.token) else LoginUiState.Error("Invalid \\"$name\\"")
+        }
+    }
+}
+
+"""
+
+
+def legacy_strip_comments(text: str) -> str:
+    text = LEGACY_BLOCK_COMMENT_RE.sub("", text)
+    return LEGACY_LINE_COMMENT_RE.sub("", text)
+
+
+def unterminated_block_comments(size: int) -> str:
+    return ("val a = 1 /* open\n" * (size // 18 + 1))[:size]
+
+
+def unterminated_strings(size: int) -> str:
+    return ('val s = "no end \\" here\n' * (size // 25 + 1))[:size]
+
+
+def deep_comment_nesting(size: int) -> str:
+    depth = size // 4
+    return "/*" * depth + "*/" * depth
+
+
+def slashes_in_strings(size: int) -> str:
+    return ('val url = "https://x.y/a//b/*c" + "//"\n' * (size // 39 + 1))[:size]
+
+
+def nested_templates(size: int) -> str:
+    unit = 'val t = "a${ f("b${ g("c//d") /* x */ }e") }f" // tail\n'
+    return unit * (size // len(unit) + 1)
+
+
+def realistic_source(size: int) -> str:
+    return (REALISTIC_UNIT * (size // len(REALISTIC_UNIT) + 1))[:size]
+
+
+INPUTS: Dict[str, Callable[[int], str]] = {
+    "unterminated_block_comments": unterminated_block_comments,
+    "unterminated_strings": unterminated_strings,
+    "deep_comment_nesting": deep_comment_nesting,
+    "slashes_in_strings": slashes_in_strings,
+    "nested_templates": nested_templates,
+}
+
+
+def time_strip(fn: Callable[[str], str], text: str) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn(text)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return elapsed / calls
+
+
+def best_time(fn: Callable[[str], str], text: str) -> float:
+    return min(time_strip(fn, text) for _ in range(REALISTIC_REPEAT))
+
+
+def slope(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    if len(sizes) < 2:
+        return None
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def format_slope(value: Optional[float]) -> str:
+    return "   n/a" if value is None else f"{value:6.2f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Scaling of Kotlin comment stripping on adversarial inputs, and its cost on ordinary sources."
+    )
+    parser.add_argument("--base", type=int, default=16000, help="Smallest input size in characters.")
+    parser.add_argument("--steps", type=int, default=5, help="Number of doublings to time.")
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=64000,
+        help="Largest input timed with the old regex stripping, which is quadratic on some inputs.",
+    )
+    parser.add_argument(
+        "--realistic-size",
+        type=int,
+        default=656000,
+        help="Characters of ordinary Kotlin timed against the old regex stripping.",
+    )
+    args = parser.parse_args()
+
+    sizes = [args.base * 2 ** step for step in range(max(2, args.steps))]
+    failures = []
+    print(f"{'input':28} {'size':>8} {'lexer':>10} {'regex':>10}")
+    for name, make in INPUTS.items():
+        lexer_times = []
+        legacy_sizes = []
+        legacy_times = []
+        for size in sizes:
+            text = make(size)
+            lexer_times.append(time_strip(strip_kotlin_comments, text))
+            legacy = ""
+            if size <= args.legacy_limit:
+                legacy_sizes.append(size)
+                legacy_times.append(time_strip(legacy_strip_comments, text))
+                legacy = f"{legacy_times[-1] * 1e3:8.2f}ms"
+            print(f"{name:28} {size:8d} {lexer_times[-1] * 1e3:8.2f}ms {legacy:>10}")
+        lexer_slope = slope(sizes, lexer_times)
+        print(f"{name:28} slope lexer {format_slope(lexer_slope)}  regex {format_slope(slope(legacy_sizes, legacy_times))}")
+        if lexer_slope is not None and lexer_slope > MAX_LINEAR_SLOPE:
+            failures.append(name)
+
+    text = realistic_source(args.realistic_size)
+    lexer_time = best_time(strip_kotlin_comments, text)
+    legacy_time = best_time(legacy_strip_comments, text)
+    ratio = lexer_time / legacy_time
+    print(
+        f"{'realistic_source':28} {len(text):8d} {lexer_time * 1e3:8.2f}ms {legacy_time * 1e3:8.2f}ms"
+        f"  {ratio:.1f}x the regex"
+    )
+
+    status = 0
+    if failures:
+        print(f"Superlinear lexer scaling (slope > {MAX_LINEAR_SLOPE}): " + ", ".join(failures))
+        status = 1
+    else:
+        print("Lexer scales linearly on every input.")
+    if ratio > MAX_LEGACY_RATIO:
+        print(f"Lexer is {ratio:.1f}x the regex stripping on ordinary sources (limit {MAX_LEGACY_RATIO}x).")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
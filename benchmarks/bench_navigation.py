@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent / "skills"
+sys.path.insert(0, str(SKILLS_ROOT))
+
+from docscan.structure import build_navigation
+
+
+def legacy_build_navigation(candidates: List[Dict[str, List[str]]]) -> List[dict]:
+    # The list-of-dicts join build_structure used before edges were interned.
+    navigation = []
+    for summary in candidates:
+        for screen in summary["screens"]:
+            for sheet in summary["sheets"]:
+                navigation.append({"from": screen, "to": sheet, "event": "state_driven_sheet"})
+    navigation.sort(key=lambda item: (item["from"], item["to"], item["event"]))
+    return navigation
+
+
+def make_candidates(files: int, screens: int, sheets: int, features: int) -> List[Dict[str, List[str]]]:
+    # Large feature files that share their screens and sheets with the rest of
+    # the feature, so many files repeat the same screen x sheet pairs.
+    candidates = []
+    for index in range(files):
+        feature = index % features
+        candidates.append(
+            {
+                "screens": [f"Feature{feature}Part{part}Screen" for part in range(screens)],
+                "sheets": [f"Feature{feature}Part{part}BottomSheet" for part in range(sheets)],
+            }
+        )
+    return candidates
+
+
+def measure(build: Callable, candidates: List[Dict[str, List[str]]]) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    navigation = build(candidates)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"edges": len(navigation), "seconds": elapsed, "retained": retained, "peak": peak}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memory of the screen -> sheet navigation join.")
+    parser.add_argument("--files", type=int, default=2000, help="Candidate files (screens and sheets).")
+    parser.add_argument("--screens", type=int, default=20, help="Screens declared per file.")
+    parser.add_argument("--sheets", type=int, default=15, help="Sheets declared per file.")
+    parser.add_argument("--features", type=int, default=400, help="Distinct features the files belong to.")
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.files, args.screens, args.sheets, args.features)
+    print(f"{'join':10} {'edges':>9} {'time':>9} {'retained':>12} {'peak':>12}")
+    for name, build in (("dicts", legacy_build_navigation), ("interned", build_navigation)):
+        result = measure(build, candidates)
+        print(
+            f"{name:10} {result['edges']:9d} {result['seconds']:8.3f}s "
+            f"{result['retained'] / 2 ** 20:9.1f} MiB {result['peak'] / 2 ** 20:9.1f} MiB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent / "skills"
+sys.path.insert(0, str(SKILLS_ROOT / "kmp-docs-generator"))
+sys.path.insert(1, str(SKILLS_ROOT))
+
+from docscan.structure import find_anchors, summarize_kotlin_source
+from run import SCAN_ANCHORS, scan_kotlin_file
+
+WORDS = [
+    "val", "var", "fun", "class", "private", "override", "suspend", "return",
+    "repository", "userId", "result", "String", "Int", "List", "map", "filter",
+    "when", "else", "import", "package", "data", "object", "companion",
+]
+
+
+def make_no_hit_source(lines: int, seed: int) -> str:
+    rng = random.Random(seed)
+    body = []
+    for _ in range(lines):
+        body.append("    " + " ".join(rng.choice(WORDS) for _ in range(8)))
+    return "package com.example.data\n\nclass Repository {\n" + "\n".join(body) + "\n}\n"
+
+
+def time_per_file(texts, anchors_for) -> float:
+    rel = "shared/src/commonMain/kotlin/Repository.kt"
+    start = time.perf_counter()
+    for text in texts:
+        anchors = anchors_for(text)
+        scan_kotlin_file(rel, text, anchors)
+        summarize_kotlin_source(text, anchors)
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-file scan cost on Kotlin files with no detector hits.")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = [make_no_hit_source(args.lines, seed) for seed in range(args.files)]
+    all_anchors = set(SCAN_ANCHORS)
+    battery = time_per_file(texts, lambda text: all_anchors)
+    prefiltered = time_per_file(texts, lambda text: find_anchors(text, SCAN_ANCHORS))
+    size = sum(len(text) for text in texts) / len(texts)
+
+    print(f"files: {args.files}, avg size: {size:.0f} chars")
+    print(f"full regex battery: {battery * 1e6:9.1f} us/file")
+    print(f"anchor prefilter:   {prefiltered * 1e6:9.1f} us/file")
+    print(f"speedup:            {battery / prefiltered:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent / "skills"
+ENTRY_POINTS = {
+    "kmp-docs-generator/run.py": SKILLS_ROOT / "kmp-docs-generator" / "run.py",
+    "kmp-docs-generator/extract_structure.py": SKILLS_ROOT / "kmp-docs-generator" / "extract_structure.py",
+    "update-doc-skill/run.py": SKILLS_ROOT / "update-doc-skill" / "run.py",
+    "android-docs/scripts/generate_docs.py": SKILLS_ROOT / "android-docs" / "scripts" / "generate_docs.py",
+}
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_import_times(stderr: str) -> List[Tuple[str, int]]:
+    """Return (module, cumulative microseconds) for every top-level import."""
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if match and not match.group(3):
+            imports.append((match.group(4), int(match.group(2))))
+    return imports
+
+
+def measure(script: Path, repeat: int) -> Dict[str, object]:
+    walls = []
+    imports: List[Tuple[str, int]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", str(script), "--help"],
+            cwd=script.parent,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        walls.append(time.perf_counter() - start)
+        imports = parse_import_times(result.stderr)
+    return {
+        "wall": statistics.median(walls),
+        "imports": sum(cumulative for _, cumulative in imports) / 1e6,
+        "heaviest": sorted(imports, key=lambda item: -item[1]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Interpreter startup and import cost of each skill entry point.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point; the median wall time is kept.")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level imports to list per entry point.")
+    args = parser.parse_args()
+
+    for name, script in ENTRY_POINTS.items():
+        result = measure(script, max(1, args.repeat))
+        print(f"{name:42} startup {result['wall'] * 1e3:7.1f} ms  imports {result['imports'] * 1e3:7.1f} ms")
+        for module, cumulative in result["heaviest"][: args.top]:
+            print(f"    {module:38} {cumulative / 1e3:7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_ROOT = Path(__file__).resolve().parent
+SKILLS_ROOT = BENCH_ROOT.parent / "skills"
+sys.path.insert(0, str(SKILLS_ROOT / "kmp-docs-generator"))
+sys.path.insert(1, str(SKILLS_ROOT / "android-docs" / "scripts"))
+
+import generate_docs
+import run as kmp_run
+from docscan.scan_engine import CACHE_DIR_NAME
+from docscan.structure import collect_structure
+from synthetic_repo import generate_repo
+
+DEFAULT_SIZES = "1000,10000"
+DEFAULT_BASELINE = BENCH_ROOT / "baselines" / "default.json"
+DEFAULT_THRESHOLD = 0.25
+# Timings below this are dominated by noise and never count as regressions.
+MIN_SECONDS = 0.05
+
+
+def bench_collect_structure(root: Path) -> None:
+    collect_structure(str(root))
+
+
+def bench_kmp_main(root: Path) -> None:
+    kmp_run.main([])
+
+
+def bench_android_main(root: Path) -> None:
+    generate_docs.main([])
+
+
+CASES: Dict[str, tuple] = {
+    "collect_structure": ("kmp", bench_collect_structure),
+    "kmp_main": ("kmp", bench_kmp_main),
+    "android_main": ("android", bench_android_main),
+}
+
+
+def time_call(fn: Callable[[Path], None], root: Path) -> float:
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(root)
+            return time.perf_counter() - start
+    finally:
+        os.chdir(previous)
+
+
+def run_case(fn: Callable[[Path], None], root: Path, repeat: int) -> Dict[str, float]:
+    cold = []
+    warm = []
+    for _ in range(repeat):
+        shutil.rmtree(root / CACHE_DIR_NAME, ignore_errors=True)
+        cold.append(time_call(fn, root))
+        warm.append(time_call(fn, root))
+    return {"cold": min(cold), "warm": min(warm)}
+
+
+def run_benchmarks(sizes: List[int], cases: List[str], repeat: int, workdir: Path, modules: int) -> dict:
+    results = {}
+    for size in sizes:
+        roots = {}
+        for kind in sorted({CASES[name][0] for name in cases}):
+            roots[kind] = workdir / f"{kind}-{size}"
+            generate_repo(kind, roots[kind], size, modules)
+        for name in cases:
+            kind, fn = CASES[name]
+            key = f"{name}@{size}"
+            results[key] = run_case(fn, roots[kind], repeat)
+            print(f"{key:28} cold {results[key]['cold']:8.3f}s  warm {results[key]['warm']:8.3f}s", flush=True)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def load_results(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+    for key, metrics in sorted(current["results"].items()):
+        reference = baseline["results"].get(key)
+        if reference is None:
+            print(f"{key:28} (no baseline)")
+            continue
+        for metric, seconds in sorted(metrics.items()):
+            expected = reference.get(metric)
+            if not expected:
+                continue
+            ratio = seconds / expected
+            flag = ""
+            if ratio > 1 + threshold and seconds - expected > MIN_SECONDS:
+                flag = "  REGRESSION"
+                regressions.append(f"{key} {metric}")
+            print(f"{key:28} {metric:5} {expected:8.3f}s -> {seconds:8.3f}s  {ratio:5.2f}x{flag}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time the documentation skills on synthetic repositories.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate synthetic repositories and time every case.")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated file counts (default {DEFAULT_SIZES}).")
+    run_parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases to run.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is kept.")
+    run_parser.add_argument("--modules", type=int, default=4, help="Gradle modules per synthetic repository.")
+    run_parser.add_argument("--workdir", help="Where to generate repositories (default: a temporary directory).")
+    run_parser.add_argument("--output", help="Write results as JSON to this path.")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    run_parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser("compare", help="Compare a results file against the stored baseline.")
+    compare_parser.add_argument("results", help="Results JSON written by `run --output`.")
+    compare_parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown before a case is flagged (default {DEFAULT_THRESHOLD:.0%}).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "compare":
+        regressions = compare_results(load_results(Path(args.results)), load_results(Path(args.baseline)), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): " + ", ".join(regressions))
+            return 1
+        print("No regressions.")
+        return 0
+
+    sizes = [int(value) for value in args.sizes.split(",") if value]
+    cases = [value for value in args.cases.split(",") if value]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"Error: unknown case(s): {', '.join(unknown)}")
+        return 1
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="docs-bench-"))
+    try:
+        data = run_benchmarks(sizes, cases, max(1, args.repeat), workdir, args.modules)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    if args.output:
+        save_results(Path(args.output), data)
+    if args.save_baseline:
+        save_results(Path(args.baseline), data)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if Path(args.baseline).exists():
+        regressions = compare_results(data, load_results(Path(args.baseline)), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import shutil
+from pathlib import Path
+from typing import List
+
+WORDS = [
+    "val", "var", "fun", "private", "override", "suspend", "return", "repository",
+    "userId", "result", "String", "Int", "List", "map", "filter", "when", "else",
+]
+FILLER_LINES = 40
+KMP_KINDS = ["screen", "uistate", "viewmodel", "repository", "usecase", "model"]
+ANDROID_KINDS = ["activity", "fragment", "presenter", "repository", "model"]
+DEPENDENCIES = [
+    "io.insert-koin:koin-core:3.5.3",
+    "io.ktor:ktor-client-core:2.3.7",
+    "org.jetbrains.kotlinx:kotlinx-coroutines-core:1.8.0",
+    "org.jetbrains.kotlinx:kotlinx-serialization-json:1.6.2",
+    "com.squareup.retrofit2:retrofit:2.9.0",
+    "com.google.dagger:hilt-android:2.50",
+    "com.google.firebase:firebase-analytics:21.5.0",
+]
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def filler(rng: random.Random, lines: int) -> str:
+    return "\n".join("    // " + " ".join(rng.choice(WORDS) for _ in range(8)) for _ in range(lines))
+
+
+def module_names(modules: int) -> List[str]:
+    return [f"feature{index:02d}" for index in range(max(0, modules - 2))]
+
+
+def kmp_source(kind: str, name: str, package: str, rng: random.Random) -> str:
+    header = f"package {package}\n\n"
+    body = filler(rng, FILLER_LINES)
+    if kind == "screen":
+        sheet = f"    if (state.showSheet) {name}BottomSheet()\n" if rng.random() < 0.3 else ""
+        return (
+            header
+            + "@Composable\n"
+            + f"fun {name}Screen(state: {name}UiState) {{\n{sheet}{body}\n}}\n"
+        )
+    if kind == "uistate":
+        return header + f"data class {name}UiState(val loading: Boolean = false, val showSheet: Boolean = false)\n"
+    if kind == "viewmodel":
+        return header + f"class {name}ViewModel : ViewModel() {{\n    val state = {name}UiState()\n{body}\n}}\n"
+    if kind == "repository":
+        return header + f"class {name}Repository {{\n{body}\n}}\n"
+    if kind == "usecase":
+        return header + f"class {name}UseCase(private val repository: {name}Repository) {{\n{body}\n}}\n"
+    return header + f"data class {name}Model(val id: String)\n\nobject {name}Mapper {{\n{body}\n}}\n"
+
+
+def kmp_layer(kind: str) -> str:
+    if kind in ("screen", "uistate", "viewmodel"):
+        return "ui"
+    if kind == "repository":
+        return "data"
+    return "domain"
+
+
+def generate_kmp_repo(root: Path, files: int, modules: int = 4, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    features = module_names(modules)
+    includes = ", ".join(f'":{name}"' for name in ["composeApp", "shared", *features])
+    write(root / "settings.gradle.kts", f"rootProject.name = \"synthetic\"\ninclude({includes})\n")
+    write(root / "build.gradle.kts", "plugins {\n    kotlin(\"multiplatform\") apply false\n}\n")
+    for name in ["composeApp", "shared", *features]:
+        deps = "\n".join(f'    implementation("{dep}")' for dep in rng.sample(DEPENDENCIES, 3))
+        write(root / name / "build.gradle.kts", f"dependencies {{\n{deps}\n}}\n")
+
+    app_src = root / "composeApp" / "src"
+    write(app_src / "androidMain/kotlin/com/example/MainActivity.kt", "class MainActivity : ComponentActivity()\n")
+    write(
+        app_src / "iosMain/kotlin/com/example/MainViewController.kt",
+        "fun MainViewController() = ComposeUIViewController { App() }\n",
+    )
+    routes = "\n".join(f'        composable("feature{index}") {{ Feature{index}Screen() }}' for index in range(20))
+    write(
+        app_src / "commonMain/kotlin/com/example/App.kt",
+        f"@Composable\nfun App() {{\n    NavHost {{\n{routes}\n    }}\n}}\n\nobject RootNavGraph\n",
+    )
+
+    owners = ["composeApp", "shared", *features]
+    for index in range(max(0, files - 3)):
+        owner = owners[index % len(owners)]
+        kind = KMP_KINDS[index % len(KMP_KINDS)]
+        name = f"Feature{index // len(KMP_KINDS)}"
+        package = f"com.example.{owner.lower()}.{kmp_layer(kind)}.group{index // 500}"
+        path = root / owner / "src/commonMain/kotlin" / package.replace(".", "/") / f"{name}{kind.capitalize()}.kt"
+        write(path, kmp_source(kind, name, package, rng))
+
+
+def android_source(kind: str, name: str, package: str, rng: random.Random, java: bool) -> str:
+    body = filler(rng, FILLER_LINES)
+    if java:
+        return f"package {package};\n\npublic class {name}Fragment extends Fragment {{\n{body}\n}}\n"
+    header = f"package {package}\n\n"
+    if kind == "activity":
+        return header + f"class {name}Activity : AppCompatActivity() {{\n{body}\n}}\n"
+    if kind == "presenter":
+        return header + f"class {name}Presenter : BasePresenter() {{\n{body}\n}}\n"
+    if kind == "repository":
+        return header + f"class {name}Repository {{\n{body}\n}}\n"
+    return header + f"data class {name}Model(val id: String)\n"
+
+
+def generate_android_repo(root: Path, files: int, modules: int = 3, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    libraries = [f"lib{index:02d}" for index in range(max(0, modules - 2))]
+    includes = ", ".join(f"':{name}'" for name in ["app", "dabase", *libraries])
+    write(root / "settings.gradle", f"include {includes}\n")
+    write(root / "build.gradle", "buildscript {}\n")
+    deps = "\n".join(f"    implementation '{dep}'" for dep in DEPENDENCIES)
+    write(root / "app" / "build.gradle", f"dependencies {{\n{deps}\n}}\n")
+    write(root / "dabase" / "build.gradle", "")
+    for name in libraries:
+        write(root / name / "build.gradle", "")
+
+    package = "com.example.app"
+    java_root = root / "app" / "src" / "main" / "java" / "com" / "example" / "app"
+    write(java_root / "App.kt", f"package {package}\n\nclass App : Application()\n")
+    routes = "\n".join(f"    fun goToFeature{index}() {{}}" for index in range(20))
+    write(java_root / "Router.kt", f"package {package}\n\nclass Router {{\n{routes}\n}}\n")
+    write(java_root / "di" / "ApiModule.kt", f"package {package}.di\n\nclass ApiModule\n")
+    base_root = root / "dabase" / "src" / "main" / "java" / "com" / "example" / "base"
+    write(base_root / "Navigate.kt", "class Navigate {\n    fun showDialog() {}\n    fun openLogin() {}\n}\n")
+    write(base_root / "BasePresenter.kt", "open class BasePresenter\n")
+    write(base_root / "LoginActivity.kt", "class LoginActivity\n")
+
+    activities = []
+    count = max(0, files - 6)
+    for index in range(count):
+        kind = ANDROID_KINDS[index % len(ANDROID_KINDS)]
+        feature = f"feature{index // len(ANDROID_KINDS)}"
+        name = f"Feature{index // len(ANDROID_KINDS)}"
+        java = kind == "fragment"
+        if kind in ("activity", "fragment", "presenter"):
+            directory = java_root / "ui" / "scenes" / feature
+            file_package = f"{package}.ui.scenes.{feature}"
+        else:
+            layer = "data" if kind == "repository" else "domain"
+            directory = java_root / layer / f"group{index // 500}"
+            file_package = f"{package}.{layer}.group{index // 500}"
+        suffix = {"activity": "Activity", "fragment": "Fragment", "presenter": "Presenter"}.get(kind, kind.capitalize())
+        extension = ".java" if java else ".kt"
+        write(directory / f"{name}{suffix}{extension}", android_source(kind, name, file_package, rng, java))
+        if kind == "activity":
+            activities.append(f".ui.scenes.{feature}.{name}Activity")
+
+    entries = []
+    for position, activity in enumerate(activities):
+        if position == 0:
+            entries.append(
+                f'        <activity android:name="{activity}">\n'
+                "            <intent-filter>\n"
+                '                <action android:name="android.intent.action.MAIN" />\n'
+                '                <category android:name="android.intent.category.LAUNCHER" />\n'
+                "            </intent-filter>\n"
+                "        </activity>"
+            )
+        else:
+            entries.append(f'        <activity android:name="{activity}" />')
+    write(
+        root / "app" / "src" / "main" / "AndroidManifest.xml",
+        '<manifest xmlns:android="http://schemas.android.com/apk/res/android" package="com.example.app">\n'
+        '    <application android:name=".App">\n'
+        + "\n".join(entries)
+        + "\n    </application>\n</manifest>\n",
+    )
+
+    graphs = max(1, len(activities) // 50)
+    for graph in range(graphs):
+        fragments = []
+        for index in range(graph * 50, min(len(activities), (graph + 1) * 50)):
+            target = f"feature{index + 1}"
+            fragments.append(
+                f'    <fragment android:id="@+id/feature{index}" android:name="{package}.Feature{index}Fragment">\n'
+                f'        <action android:id="@+id/to_{target}" android:destination="@id/{target}" />\n'
+                "    </fragment>"
+            )
+        write(
+            root / "app" / "src" / "main" / "res" / "navigation" / f"graph{graph}.xml",
+            '<navigation xmlns:android="http://schemas.android.com/apk/res/android" '
+            f'android:id="@+id/graph{graph}">\n' + "\n".join(fragments) + "\n</navigation>\n",
+        )
+
+
+def generate_repo(kind: str, root: Path, files: int, modules: int, seed: int = 0) -> None:
+    if root.exists():
+        shutil.rmtree(root)
+    if kind == "kmp":
+        generate_kmp_repo(root, files, modules, seed)
+    else:
+        generate_android_repo(root, files, modules, seed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic KMP or Android repository for benchmarks.")
+    parser.add_argument("kind", choices=["kmp", "android"])
+    parser.add_argument("output", help="Directory to create (replaced if it exists).")
+    parser.add_argument("--files", type=int, default=1000, help="Approximate number of source files.")
+    parser.add_argument("--modules", type=int, default=4, help="Number of Gradle modules.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_repo(args.kind, Path(args.output), args.files, args.modules, args.seed)
+    print(f"{args.kind} repository with ~{args.files} files written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,32 +1,64 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import re
-import xml.etree.ElementTree as ET
+import sys
 from pathlib import Path
 
-
-def read_text(path):
-    try:
-        return Path(path).read_text(encoding="utf-8")
-    except Exception:
-        return ""
-
-
-def write_text(path, content):
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(content, encoding="utf-8")
-
-
-def find_file(root, filename):
-    for dirpath, _, filenames in os.walk(root):
-        if filename in filenames:
-            return os.path.join(dirpath, filename)
-    return None
-
-
-def find_dir(root, dirname):
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from docscan import gradle
+from docscan.gradle import classify_dependencies, extract_gradle_dependencies
+from docscan.scan_engine import (
+    RepositorySnapshot,
+    add_profile_arguments,
+    add_scan_arguments,
+    finish_profiling,
+    format_generated_summary,
+    format_write_summary,
+    profile_phase,
+    scan_files,
+    scan_options_from_args,
+    schema_key,
+    shared_result_store,
+    start_profiling,
+    write_outputs,
+)
+from docscan.templates import fill_template, read_text
+
+CLASS_RE = re.compile(r"\bclass\s+([A-Za-z0-9_]+)")
+FUNCTION_RE = re.compile(r"\bfun\s+([A-Za-z0-9_]+)\s*\(")
+ROUTE_PREFIXES = ("goTo", "open", "navigate", "show")
+# Class name suffixes recorded as the declaration's kind, first match wins.
+CLASS_KINDS = ("Activity", "Fragment", "Presenter", "ViewModel", "Interactor", "Repository", "Adapter", "Module")
+FEATURE_MARKER = "/ui/scenes/"
+SCAN_CACHE_NAME = "android-docs"
+DEPENDENCY_CATEGORIES = (
+    ("di", ("hilt", "dagger", "koin")),
+    ("network", ("retrofit", "okhttp", "moshi")),
+    ("db", ("room", "sqlite", "datastore")),
+    ("async", ("coroutines", "rxjava")),
+    ("firebase", ("firebase",)),
+    ("testing", ("junit", "espresso", "mockito")),
+)
+SOURCE_EXTENSIONS = (".kt", ".java")
+# Tooling directories never hold project sources; build output is pruned only where .gitignore says so.
+SNAPSHOT_SKIP_DIRS = {".git", ".gradle", ".idea"}
+# Bump when scan_source_file changes in a way the patterns below do not capture.
+SCAN_VERSION = 1
+SCAN_SCHEMA = schema_key(SCAN_VERSION, CLASS_RE, FUNCTION_RE, *ROUTE_PREFIXES)
+ANDROID_NS = "{http://schemas.android.com/apk/res/android}"
+MANIFEST_NAME = "AndroidManifest.xml"
+NAV_DESTINATION_TAGS = ("fragment", "activity", "dialog", "navigation")
+XML_CACHE_NAME = "android-docs-xml"
+# Bump when parse_manifest or parse_nav_graph change their output.
+XML_VERSION = 1
+XML_SCHEMA = schema_key(XML_VERSION, ANDROID_NS, MANIFEST_NAME, *NAV_DESTINATION_TAGS)
+
+
+def find_dir(snapshot, root, dirname):
     candidate = os.path.join(root, dirname)
-    return candidate if os.path.isdir(candidate) else None
+    return candidate if snapshot.is_dir(candidate) else None
 
 
 def sanitize_label(value):
@@ -37,7 +69,7 @@ def sanitize_label(value):
     return value or "Unknown"
 
 
-def resolve_class_to_path(class_name, package_name, module_dir):
+def resolve_class_to_path(snapshot, class_name, package_name, module_dir):
     if not class_name:
         return ""
     if class_name.startswith("."):
@@ -49,64 +81,169 @@ def resolve_class_to_path(class_name, package_name, module_dir):
     rel = full.replace(".", "/")
     kotlin_path = os.path.join(module_dir, "src/main/java", rel + ".kt")
     java_path = os.path.join(module_dir, "src/main/java", rel + ".java")
-    if os.path.exists(kotlin_path):
+    if snapshot.has_file(kotlin_path):
         return kotlin_path
-    if os.path.exists(java_path):
+    if snapshot.has_file(java_path):
         return java_path
     return ""
 
 
-def parse_manifest(manifest_path):
-    if not manifest_path or not os.path.exists(manifest_path):
-        return {"package": "", "application": "", "launcher": "", "activities": []}
-    tree = ET.parse(manifest_path)
-    root = tree.getroot()
-    package_name = root.attrib.get("package", "")
-    android_ns = "{http://schemas.android.com/apk/res/android}"
-    application = root.find("application")
-    application_name = ""
-    launcher_activity = ""
+def empty_manifest():
+    return {"package": "", "application": "", "launcher": "", "activities": []}
+
+
+def iter_xml_events(source):
+    # iterparse reads the binary file in chunks, so elements can be cleared as
+    # soon as they end and the document is never held whole in memory.
+    import xml.etree.ElementTree as ET
+
+    return ET.iterparse(source, events=("start", "end"))
+
+
+def is_launcher_activity(activity):
+    for intent in activity.findall("intent-filter"):
+        has_main = any(
+            act.attrib.get(ANDROID_NS + "name") == "android.intent.action.MAIN" for act in intent.findall("action")
+        )
+        has_launcher = any(
+            cat.attrib.get(ANDROID_NS + "name") == "android.intent.category.LAUNCHER"
+            for cat in intent.findall("category")
+        )
+        if has_main and has_launcher:
+            return True
+    return False
+
+
+def parse_manifest(source):
+    """Read package, application, launcher and activities from a manifest.
+
+    Activities are listed up to and including the launcher. Each child of
+    <application> is cleared once read, so only the element being parsed
+    stays in memory.
+    """
+    manifest = empty_manifest()
+    depth = 0
+    seen_application = False
+    in_application = False
+    try:
+        for event, element in iter_xml_events(source):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    manifest["package"] = element.attrib.get("package", "")
+                elif depth == 2 and element.tag == "application" and not seen_application:
+                    seen_application = in_application = True
+                    manifest["application"] = element.attrib.get(ANDROID_NS + "name", "")
+                continue
+            depth -= 1
+            if depth == 2 and in_application:
+                if element.tag == "activity" and not manifest["launcher"]:
+                    name = element.attrib.get(ANDROID_NS + "name", "")
+                    if name:
+                        manifest["activities"].append(name)
+                        if is_launcher_activity(element):
+                            manifest["launcher"] = name
+                element.clear()
+            elif depth == 1:
+                in_application = False
+                element.clear()
+    except SyntaxError:
+        return empty_manifest()
+    return manifest
+
+
+def parse_nav_graph(source):
+    destinations = []
+    actions = []
+    try:
+        for event, element in iter_xml_events(source):
+            if event == "end":
+                element.clear()
+                continue
+            tag = element.tag.split("}")[-1]
+            if tag in NAV_DESTINATION_TAGS:
+                dest_id = element.attrib.get(ANDROID_NS + "id", "")
+                dest_name = element.attrib.get(ANDROID_NS + "name", "")
+                if dest_id or dest_name:
+                    destinations.append("{} {}".format(dest_id, dest_name).strip())
+            if tag == "action":
+                action_id = element.attrib.get(ANDROID_NS + "id", "")
+                to_dest = element.attrib.get(ANDROID_NS + "destination", "")
+                if action_id or to_dest:
+                    actions.append("{} {}".format(action_id, to_dest).strip())
+    except SyntaxError:
+        return {"destinations": [], "actions": []}
+    return {"destinations": destinations, "actions": actions}
+
+
+def scan_xml_file(rel, source):
+    if os.path.basename(rel) == MANIFEST_NAME:
+        return parse_manifest(source)
+    return parse_nav_graph(source)
+
+
+def find_source_sets(snapshot, module_dir):
+    src_dir = os.path.join(module_dir, "src")
+    names = sorted(snapshot.list_dirs(src_dir), key=lambda name: (name != "main", name))
+    return [os.path.join(src_dir, name) for name in names]
+
+
+def find_android_xml(snapshot, module_dirs):
+    """Manifests and navigation graphs of every source set, per module directory."""
+    manifests = {}
+    nav_graphs = []
+    for module_dir in module_dirs:
+        manifests[module_dir] = []
+        for source_set in find_source_sets(snapshot, module_dir):
+            manifest_path = os.path.join(source_set, MANIFEST_NAME)
+            if snapshot.has_file(manifest_path):
+                manifests[module_dir].append(manifest_path)
+            nav_dir = os.path.join(source_set, "res", "navigation")
+            for filename in sorted(snapshot.list_files(nav_dir)):
+                if filename.endswith(".xml"):
+                    nav_graphs.append(os.path.join(nav_dir, filename))
+    return manifests, nav_graphs
+
+
+def scan_android_xml(repo_root, paths, scan_options=None):
+    return scan_files(
+        repo_root, paths, scan_xml_file, XML_CACHE_NAME, XML_SCHEMA, streams=True, **(scan_options or {})
+    )
+
+
+def qualify_class_name(name, package_name):
+    return package_name + name if name.startswith(".") and package_name else name
+
+
+def merge_manifests(app_manifests, module_manifests):
+    """Merge the app's source set manifests (main first) with library module ones.
+
+    Package, application and launcher come from the first app manifest
+    declaring them. Library activities are qualified with their own package
+    so they are not resolved against the app's.
+    """
+    merged = empty_manifest()
     activities = []
-    if application is not None:
-        application_name = application.attrib.get(android_ns + "name", "")
-        for activity in application.findall("activity"):
-            name = activity.attrib.get(android_ns + "name", "")
-            if name:
-                activities.append(name)
-            intent_filters = activity.findall("intent-filter")
-            for intent in intent_filters:
-                has_main = any(
-                    act.attrib.get(android_ns + "name") == "android.intent.action.MAIN"
-                    for act in intent.findall("action")
-                )
-                has_launcher = any(
-                    cat.attrib.get(android_ns + "name") == "android.intent.category.LAUNCHER"
-                    for cat in intent.findall("category")
-                )
-                if has_main and has_launcher:
-                    launcher_activity = activity.attrib.get(android_ns + "name", "")
-                    break
-            if launcher_activity:
-                break
-    return {
-        "package": package_name,
-        "application": application_name,
-        "launcher": launcher_activity,
-        "activities": activities,
-    }
+    for manifest in app_manifests:
+        for key in ("package", "application", "launcher"):
+            merged[key] = merged[key] or manifest[key]
+        activities.extend(manifest["activities"])
+    for manifest in module_manifests:
+        activities.extend(qualify_class_name(name, manifest["package"]) for name in manifest["activities"])
+    merged["activities"] = list(dict.fromkeys(activities))
+    return merged
 
 
-def detect_modules(root):
+def detect_modules(snapshot, root):
     modules = []
     for name in ["app", "dabase"]:
-        if os.path.isdir(os.path.join(root, name)):
+        if snapshot.is_dir(os.path.join(root, name)):
             modules.append(name)
     if not modules:
-        for entry in os.listdir(root):
+        for entry in snapshot.list_dirs(root):
             path = os.path.join(root, entry)
-            if os.path.isdir(path) and (
-                os.path.exists(os.path.join(path, "build.gradle"))
-                or os.path.exists(os.path.join(path, "build.gradle.kts"))
+            if snapshot.has_file(os.path.join(path, "build.gradle")) or snapshot.has_file(
+                os.path.join(path, "build.gradle.kts")
             ):
                 modules.append(entry)
     return modules
@@ -127,12 +264,6 @@ def load_template_with_fallback(skill_root, name, fallback):
     return template if template.strip() else fallback
 
 
-def fill_template(template, data):
-    for key, value in data.items():
-        template = template.replace("{{" + key + "}}", value)
-    return template
-
-
 def relative_path(path, root):
     if not path:
         return ""
@@ -142,180 +273,155 @@ def relative_path(path, root):
         return path
 
 
-def collect_source_files(module_dir):
+def collect_source_files(snapshot, repo_root, module_dir, scan_options=None):
     src_root = os.path.join(module_dir, "src", "main", "java")
-    if not os.path.isdir(src_root):
-        return []
-    matches = []
-    for dirpath, _, filenames in os.walk(src_root):
-        for filename in filenames:
-            if filename.endswith(".kt") or filename.endswith(".java"):
-                matches.append(os.path.join(dirpath, filename))
-    return matches
+    src_prefix = os.path.relpath(src_root, repo_root) + os.sep
+    return scan_files(
+        repo_root,
+        snapshot.iter_files(SOURCE_EXTENSIONS, root=src_root),
+        scan_source_file,
+        SCAN_CACHE_NAME,
+        SCAN_SCHEMA,
+        accept=snapshot.accepts(lambda rel: rel.startswith(src_prefix) and rel.endswith(SOURCE_EXTENSIONS)),
+        scope=src_prefix,
+        skip_generated=True,
+        **(scan_options or {})
+    )
 
 
-def extract_class_names(paths, suffixes):
-    found = set()
-    pattern = re.compile(r"\bclass\s+([A-Za-z0-9_]+)")
-    for path in paths:
-        text = read_text(path)
-        for match in pattern.findall(text):
-            if any(match.endswith(suffix) for suffix in suffixes):
-                found.add(match)
-    return sorted(found)
+def scan_source_file(rel, text):
+    return {
+        "classes": CLASS_RE.findall(text),
+        "routes": [name for name in FUNCTION_RE.findall(text) if name.startswith(ROUTE_PREFIXES)],
+    }
 
 
-def extract_route_functions(paths):
-    found = set()
-    pattern = re.compile(r"\bfun\s+([A-Za-z0-9_]+)\s*\(")
-    for path in paths:
-        text = read_text(path)
-        for match in pattern.findall(text):
-            if match.startswith(("goTo", "open", "navigate", "show")):
-                found.add(match)
-    return sorted(found)
+def scan_router_files(repo_root, paths, scan_options=None):
+    return scan_files(repo_root, paths, scan_source_file, SCAN_CACHE_NAME, SCAN_SCHEMA, **(scan_options or {}))
 
 
-def extract_gradle_dependencies(text):
-    deps = []
-    pattern = re.compile(r"^\s*(implementation|api|kapt|ksp)\s+([\"'])(.+?)\2", re.MULTILINE)
-    for match in pattern.findall(text):
-        deps.append(match[2])
-    return deps
-
-
-def classify_dependencies(deps):
-    buckets = {
-        "di": [],
-        "network": [],
-        "db": [],
-        "async": [],
-        "firebase": [],
-        "testing": [],
-        "other": [],
-    }
-    for dep in deps:
-        lowered = dep.lower()
-        if "hilt" in lowered or "dagger" in lowered or "koin" in lowered:
-            buckets["di"].append(dep)
-        elif "retrofit" in lowered or "okhttp" in lowered or "moshi" in lowered:
-            buckets["network"].append(dep)
-        elif "room" in lowered or "sqlite" in lowered or "datastore" in lowered:
-            buckets["db"].append(dep)
-        elif "coroutines" in lowered or "rxjava" in lowered:
-            buckets["async"].append(dep)
-        elif "firebase" in lowered:
-            buckets["firebase"].append(dep)
-        elif "junit" in lowered or "espresso" in lowered or "mockito" in lowered:
-            buckets["testing"].append(dep)
-        else:
-            buckets["other"].append(dep)
-    return buckets
-
-
-def parse_nav_graphs(nav_dir):
-    graphs = []
-    if not os.path.isdir(nav_dir):
-        return graphs
-    for filename in sorted(os.listdir(nav_dir)):
-        if not filename.endswith(".xml"):
-            continue
-        path = os.path.join(nav_dir, filename)
-        try:
-            tree = ET.parse(path)
-            root = tree.getroot()
-        except Exception:
-            graphs.append({"file": path, "destinations": [], "actions": []})
-            continue
-        destinations = []
-        actions = []
-        for node in root.iter():
-            tag = node.tag.split("}")[-1]
-            if tag in ["fragment", "activity", "dialog", "navigation"]:
-                dest_id = node.attrib.get("{http://schemas.android.com/apk/res/android}id", "")
-                dest_name = node.attrib.get("{http://schemas.android.com/apk/res/android}name", "")
-                if dest_id or dest_name:
-                    destinations.append("{} {}".format(dest_id, dest_name).strip())
-            if tag == "action":
-                action_id = node.attrib.get("{http://schemas.android.com/apk/res/android}id", "")
-                to_dest = node.attrib.get("{http://schemas.android.com/apk/res/android}destination", "")
-                if action_id or to_dest:
-                    actions.append("{} {}".format(action_id, to_dest).strip())
-        graphs.append({"file": path, "destinations": destinations, "actions": actions})
-    return graphs
+def class_kind(name):
+    for kind in CLASS_KINDS:
+        if name.endswith(kind):
+            return kind
+    return ""
+
+
+def source_feature(path):
+    normalized = path.replace("\\", "/")
+    if FEATURE_MARKER not in normalized:
+        return ""
+    return normalized.split(FEATURE_MARKER, 1)[1].split("/", 1)[0]
 
 
-def find_package_layers(src_root):
+def build_class_table(scan):
+    """One row per class declaration in the scanned sources, built in a single pass.
+
+    Each row records the class name, its file, the feature folder under
+    ``/ui/scenes/`` (empty outside it) and its kind from CLASS_KINDS (empty
+    when no suffix matches). The doc blocks query this table instead of
+    walking the scan results again.
+    """
+    table = []
+    for path, record in scan.items():
+        feature = source_feature(path)
+        for name in record["classes"]:
+            table.append({"name": name, "file": path, "feature": feature, "kind": class_kind(name)})
+    return table
+
+
+def classes_of_kind(table, kind):
+    return sorted({row["name"] for row in table if row["kind"] == kind})
+
+
+def classes_by_feature(table, kinds):
+    features = {}
+    for row in table:
+        if row["feature"] and row["kind"] in kinds:
+            features.setdefault(row["feature"], set()).add(row["name"])
+    return features
+
+
+def extract_route_functions(records):
+    found = set()
+    for record in records:
+        found.update(record["routes"])
+    return sorted(found)
+
+
+def find_package_layers(snapshot, src_root):
     layers = {}
     for layer in ["ui", "domain", "data", "injection", "di"]:
         layer_path = os.path.join(src_root, layer)
-        if os.path.isdir(layer_path):
+        if snapshot.is_dir(layer_path):
             layers[layer] = layer_path
     return layers
 
 
-def extract_feature_components(paths):
-    features = {}
-    pattern = re.compile(r"\bclass\s+([A-Za-z0-9_]+)")
-    for path in paths:
-        normalized = path.replace("\\", "/")
-        marker = "/ui/scenes/"
-        if marker not in normalized:
-            continue
-        feature = normalized.split(marker, 1)[1].split("/", 1)[0]
-        if not feature:
-            continue
-        text = read_text(path)
-        for match in pattern.findall(text):
-            if match.endswith("Activity"):
-                features.setdefault(feature, {"activities": set(), "fragments": set()})["activities"].add(match)
-            elif match.endswith("Fragment"):
-                features.setdefault(feature, {"activities": set(), "fragments": set()})["fragments"].add(match)
-    return features
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate README.md and docs/*.md for an Android project.")
+    add_scan_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
 
 
-def main():
-    repo_root = os.getcwd()
+# The XML, source and router scans share one load and save of the result store.
+@shared_result_store()
+def generate_project_docs(repo_root, scan_options=None, snapshot=None):
     skill_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     docs_root = os.path.join(repo_root, "docs")
     Path(docs_root).mkdir(parents=True, exist_ok=True)
 
-    modules = detect_modules(repo_root)
+    snapshot = snapshot or RepositorySnapshot(repo_root, SNAPSHOT_SKIP_DIRS)
+    modules = detect_modules(snapshot, repo_root)
     if not modules and (
-        os.path.exists(os.path.join(repo_root, "build.gradle"))
-        or os.path.exists(os.path.join(repo_root, "build.gradle.kts"))
+        snapshot.has_file(os.path.join(repo_root, "build.gradle"))
+        or snapshot.has_file(os.path.join(repo_root, "build.gradle.kts"))
     ):
         modules = ["app"]
     app_module = "app" if "app" in modules else (modules[0] if modules else "app")
     dabase_module = "dabase" if "dabase" in modules else "dabase"
 
-    app_dir = find_dir(repo_root, app_module) or os.path.join(repo_root, app_module)
-    dabase_dir = find_dir(repo_root, dabase_module) or os.path.join(repo_root, dabase_module)
+    app_dir = find_dir(snapshot, repo_root, app_module) or os.path.join(repo_root, app_module)
+    dabase_dir = find_dir(snapshot, repo_root, dabase_module) or os.path.join(repo_root, dabase_module)
 
-    if not os.path.isdir(app_dir) and os.path.exists(os.path.join(repo_root, "src", "main", "AndroidManifest.xml")):
+    if not snapshot.is_dir(app_dir) and snapshot.has_file(os.path.join(repo_root, "src", "main", "AndroidManifest.xml")):
         app_dir = repo_root
 
-    manifest_path = os.path.join(app_dir, "src/main/AndroidManifest.xml")
-    manifest = parse_manifest(manifest_path)
+    module_dirs = [app_dir]
+    for module in modules:
+        module_dir = os.path.join(repo_root, module)
+        if module_dir not in module_dirs and snapshot.is_dir(module_dir):
+            module_dirs.append(module_dir)
+    manifest_paths, nav_graph_paths = find_android_xml(snapshot, module_dirs)
+    with profile_phase("xml"):
+        xml_scan = scan_android_xml(
+            repo_root, [path for paths in manifest_paths.values() for path in paths] + nav_graph_paths, scan_options
+        )
+    # A file removed since the walk has no result.
+    manifest = merge_manifests(
+        [xml_scan[path] for path in manifest_paths[app_dir] if path in xml_scan],
+        [xml_scan[path] for module_dir in module_dirs[1:] for path in manifest_paths[module_dir] if path in xml_scan],
+    )
 
-    app_path = resolve_class_to_path(manifest.get("application", ""), manifest.get("package", ""), app_dir)
-    launcher_path = resolve_class_to_path(manifest.get("launcher", ""), manifest.get("package", ""), app_dir)
+    app_path = resolve_class_to_path(snapshot, manifest.get("application", ""), manifest.get("package", ""), app_dir)
+    launcher_path = resolve_class_to_path(snapshot, manifest.get("launcher", ""), manifest.get("package", ""), app_dir)
 
-    router_path = find_file(app_dir, "Router.kt") or ""
-    api_module_path = find_file(app_dir, "ApiModule.kt") or ""
-    api_services_path = find_file(app_dir, "ApiServices.kt") or ""
+    router_path = snapshot.find_file(app_dir, "Router.kt") or ""
+    api_module_path = snapshot.find_file(app_dir, "ApiModule.kt") or ""
+    api_services_path = snapshot.find_file(app_dir, "ApiServices.kt") or ""
 
-    dabase_present_injector = find_file(dabase_dir, "PresentInjector.kt") or ""
-    dabase_context_module = find_file(dabase_dir, "ContextModule.kt") or ""
-    dabase_router_module = find_file(dabase_dir, "RouterModule.kt") or ""
-    dabase_secured_module = find_file(dabase_dir, "SecuredApiModule.kt") or ""
-    dabase_unsecured_module = find_file(dabase_dir, "UnsecuredApiModule.kt") or ""
-    dabase_base_presenter = find_file(dabase_dir, "BasePresenter.kt") or ""
-    dabase_navigate = find_file(dabase_dir, "Navigate.kt") or ""
-    dabase_login_activity = find_file(dabase_dir, "LoginActivity.kt") or ""
+    dabase_present_injector = snapshot.find_file(dabase_dir, "PresentInjector.kt") or ""
+    dabase_context_module = snapshot.find_file(dabase_dir, "ContextModule.kt") or ""
+    dabase_router_module = snapshot.find_file(dabase_dir, "RouterModule.kt") or ""
+    dabase_secured_module = snapshot.find_file(dabase_dir, "SecuredApiModule.kt") or ""
+    dabase_unsecured_module = snapshot.find_file(dabase_dir, "UnsecuredApiModule.kt") or ""
+    dabase_base_presenter = snapshot.find_file(dabase_dir, "BasePresenter.kt") or ""
+    dabase_navigate = snapshot.find_file(dabase_dir, "Navigate.kt") or ""
+    dabase_login_activity = snapshot.find_file(dabase_dir, "LoginActivity.kt") or ""
 
     pdf_assets = os.path.join(app_dir, "src/main/assets/pdfjs")
-    has_pdf_assets = os.path.isdir(pdf_assets)
+    has_pdf_assets = snapshot.is_dir(pdf_assets)
 
     firebase_enabled = has_firebase(os.path.join(app_dir, "build.gradle")) or has_firebase(
         os.path.join(app_dir, "build.gradle.kts")
@@ -323,10 +429,11 @@ def main():
 
     project_name = os.path.basename(repo_root)
 
-    source_files = collect_source_files(app_dir)
-    activity_classes = extract_class_names(source_files, ["Activity"])
-    fragment_classes = extract_class_names(source_files, ["Fragment"])
-    feature_components = extract_feature_components(source_files)
+    source_scan = collect_source_files(snapshot, repo_root, app_dir, scan_options)
+    class_table = build_class_table(source_scan)
+    activity_classes = classes_of_kind(class_table, "Activity")
+    fragment_classes = classes_of_kind(class_table, "Fragment")
+    feature_components = classes_by_feature(class_table, ("Activity", "Fragment"))
 
     manifest_activities = [
         act.lstrip(".") if act.startswith(".") else act for act in manifest.get("activities", [])
@@ -336,33 +443,36 @@ def main():
             (manifest.get("package") + act if act and not "." in act else act) for act in manifest_activities
         ]
 
-    router_files = [p for p in [router_path, dabase_navigate] if p]
-    route_functions = extract_route_functions(router_files)
+    router_files = list(dict.fromkeys(p for p in [router_path, dabase_navigate] if p))
+    # Routers under the scanned sources already have their record; only the rest are read.
+    router_scan = {path: source_scan[path] for path in router_files if path in source_scan}
+    other_routers = [path for path in router_files if path not in router_scan]
+    if other_routers:
+        router_scan.update(scan_router_files(repo_root, other_routers, scan_options))
+    route_functions = extract_route_functions(router_scan.values())
 
     nav_res_dir = os.path.join(app_dir, "src", "main", "res", "navigation")
-    has_nav_graph = os.path.isdir(nav_res_dir) and any(
-        name.endswith(".xml") for name in os.listdir(nav_res_dir)
-    )
-    nav_graphs = parse_nav_graphs(nav_res_dir)
+    has_nav_graph = any(name.endswith(".xml") for name in snapshot.list_files(nav_res_dir))
+    nav_graphs = [dict(xml_scan[path], file=path) for path in nav_graph_paths if path in xml_scan]
 
     gradle_files = []
     for name in ["build.gradle", "build.gradle.kts"]:
         path = os.path.join(repo_root, name)
-        if os.path.exists(path):
+        if snapshot.has_file(path):
             gradle_files.append(path)
     for name in ["build.gradle", "build.gradle.kts"]:
         path = os.path.join(app_dir, name)
-        if os.path.exists(path):
+        if snapshot.has_file(path):
             gradle_files.append(path)
 
     deps = []
     for path in gradle_files:
         deps.extend(extract_gradle_dependencies(read_text(path)))
     deps = sorted(set(deps))
-    deps_buckets = classify_dependencies(deps)
+    deps_buckets = classify_dependencies(deps, DEPENDENCY_CATEGORIES)
 
     src_root = os.path.join(app_dir, "src", "main", "java")
-    package_layers = find_package_layers(src_root)
+    package_layers = find_package_layers(snapshot, src_root)
 
     modules_list = []
     for module in modules or [app_module]:
@@ -504,9 +614,7 @@ def main():
             navigation_diagram += "{}[{}];\n".format(feature_node, sanitize_label(feature))
             navigation_diagram += "A --> {};\n".format(feature_node)
 
-            classes = sorted(
-                feature_components[feature]["activities"] | feature_components[feature]["fragments"]
-            )
+            classes = sorted(feature_components[feature])
             for class_name in classes[:4]:
                 class_node = "C{}".format(node_counter)
                 node_counter += 1
@@ -599,15 +707,28 @@ def main():
         skill_root, "navigation.md.tpl", default_navegacion_tpl
     )
 
-    readme = fill_template(readme_tpl, data)
-    arquitectura = fill_template(arquitectura_tpl, data)
-    navegacion = fill_template(navegacion_tpl, data)
+    with profile_phase("render"):
+        readme = fill_template(readme_tpl, data)
+        arquitectura = fill_template(arquitectura_tpl, data)
+        navegacion = fill_template(navegacion_tpl, data)
+
+    return write_outputs(
+        {
+            os.path.join(repo_root, "README.md"): readme,
+            os.path.join(docs_root, "architecture.md"): arquitectura,
+            os.path.join(docs_root, "navigation.md"): navegacion,
+        }
+    )
 
-    write_text(os.path.join(repo_root, "README.md"), readme)
-    write_text(os.path.join(docs_root, "architecture.md"), arquitectura)
-    write_text(os.path.join(docs_root, "navigation.md"), navegacion)
 
+def main(argv=None):
+    args = parse_args(argv)
+    start_profiling(args, [sys.modules[__name__], gradle])
+    written, unchanged = generate_project_docs(os.getcwd(), scan_options_from_args(args))
     print("Docs generated.")
+    print(format_write_summary(written, unchanged))
+    print(format_generated_summary())
+    finish_profiling(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+"""Scanning core shared by the documentation skills.
+
+The skills import it by putting the ``skills`` directory on ``sys.path``,
+so this folder has to be installed next to them.
+"""
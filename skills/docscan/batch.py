@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SKILLS_ROOT))
+
+from docscan.scan_engine import (
+    RepositorySnapshot,
+    add_scan_arguments,
+    resolve_jobs,
+    scan_options_from_args,
+    shared_result_store,
+)
+
+SKILL_SCRIPTS = {
+    "kmp": os.path.join("kmp-docs-generator", "run.py"),
+    "android": os.path.join("android-docs", "scripts", "generate_docs.py"),
+}
+GRADLE_BUILD_FILES = ("build.gradle.kts", "build.gradle")
+GLOB_CHARS = "*?["
+
+
+def load_skill(skill: str) -> ModuleType:
+    # The skill scripts are not packages; load them once per process by path.
+    name = f"docscan_{skill}_skill"
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, SKILLS_ROOT / SKILL_SCRIPTS[skill])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def expand_roots(patterns: List[str]) -> Tuple[List[str], List[str]]:
+    roots = set()
+    missing = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if any(char in pattern for char in GLOB_CHARS) else [pattern]
+        directories = [match for match in matches if os.path.isdir(match)]
+        if not directories:
+            missing.append(pattern)
+        roots.update(os.path.realpath(directory) for directory in directories)
+    return sorted(roots), missing
+
+
+def group_roots(roots: List[str]) -> List[List[str]]:
+    """Group nested roots under their outermost root, which holds the shared store."""
+    groups: List[List[str]] = []
+    for root in sorted(roots, key=lambda path: path.split(os.sep)):
+        if groups and root.startswith(os.path.join(groups[-1][0], "")):
+            groups[-1].append(root)
+        else:
+            groups.append([root])
+    return groups
+
+
+def detect_skill(root: str) -> Tuple[Optional[str], Optional[RepositorySnapshot]]:
+    kmp = load_skill("kmp")
+    snapshot = kmp.repository_snapshot(root)
+    project_root = Path(root)
+    if kmp.find_common_main(project_root, kmp.detect_modules(project_root, snapshot), snapshot):
+        return "kmp", snapshot
+    android = load_skill("android")
+    if android.detect_modules(snapshot, root) or any(
+        snapshot.has_file(os.path.join(root, name)) for name in GRADLE_BUILD_FILES
+    ):
+        # android-docs walks with its own skip list, so it builds its own snapshot.
+        return "android", None
+    return None, None
+
+
+def document_group(roots: List[str], scan_options: Dict[str, Any]) -> List[dict]:
+    options = dict(scan_options, cache_root=roots[0])
+    reports = []
+    # The projects of a group share one store, loaded and saved once for all of them.
+    with shared_result_store():
+        for root in roots:
+            report = {"root": root, "skill": None, "written": 0, "unchanged": 0, "error": None}
+            try:
+                skill, snapshot = detect_skill(root)
+                report["skill"] = skill
+                if skill == "kmp":
+                    written, unchanged = load_skill("kmp").generate_project_docs(Path(root), options, snapshot)
+                elif skill == "android":
+                    written, unchanged = load_skill("android").generate_project_docs(root, options)
+                else:
+                    written, unchanged = [], []
+                report["written"], report["unchanged"] = len(written), len(unchanged)
+            except Exception as exc:  # one broken project must not stop the batch
+                report["error"] = f"{type(exc).__name__}: {exc}"
+            reports.append(report)
+    return reports
+
+
+def run_batch(groups: List[List[str]], scan_options: Dict[str, Any], workers: int) -> List[dict]:
+    workers = min(resolve_jobs(workers), len(groups))
+    if workers <= 1:
+        return [report for group in groups for report in document_group(group, scan_options)]
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Groups never share a store, so they can run side by side; the projects
+    # of one group run in order because they read and write the same store.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(partial(document_group, scan_options=scan_options), groups))
+    return [report for reports in outcomes for report in reports]
+
+
+def format_report(report: dict) -> str:
+    name = os.path.relpath(report["root"])
+    if report["error"]:
+        return f"{name}: failed ({report['error']})"
+    if report["skill"] is None:
+        return f"{name}: skipped, no KMP or Android Gradle project found"
+    return f"{name}: {report['skill']} -> Written: {report['written']}, unchanged: {report['unchanged']}."
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate the docs of many Android/KMP projects in one run.",
+        fromfile_prefix_chars="@",
+        epilog="KMP projects (modules with src/commonMain) get kmp-docs-generator, other Gradle projects "
+        "android-docs. Nested roots share the outermost root's .docs-cache store. "
+        "Use @file to read roots from a file, one per line.",
+    )
+    parser.add_argument("roots", nargs="+", help="Project roots or glob patterns (e.g. 'apps/*').")
+    parser.add_argument("--workers", type=int, default=0, help="Projects documented in parallel (0 = all cores).")
+    add_scan_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    roots, missing = expand_roots(args.roots)
+    for pattern in missing:
+        print(f"Warning: no project directory matches {pattern}")
+    if not roots:
+        print("Error: no project roots to document.")
+        return 1
+    reports = run_batch(group_roots(roots), scan_options_from_args(args), args.workers)
+    for report in reports:
+        print(format_report(report))
+    failed = sum(1 for report in reports if report["error"])
+    documented = sum(1 for report in reports if report["skill"] and not report["error"])
+    print(f"Documented {documented} of {len(reports)} project(s), {failed} failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Kotlin DSL ``implementation("group:artifact:1.0")`` / ``implementation(libs.foo)``
+# and Groovy ``implementation 'group:artifact:1.0'``.
+GRADLE_DEPENDENCY_RE = re.compile(
+    r"^\s*(implementation|api|kapt|ksp)(?:\s*\((.+)\)\s*(?://.*)?$|\s+([\"'])(.+?)\3)",
+    re.MULTILINE,
+)
+
+# (bucket, substrings) pairs; the first bucket with a matching substring wins.
+DependencyCategories = Sequence[Tuple[str, Tuple[str, ...]]]
+
+
+def extract_gradle_dependencies(text: str) -> List[str]:
+    deps = []
+    for match in GRADLE_DEPENDENCY_RE.finditer(text):
+        arg = match.group(2)
+        if arg is None:
+            deps.append(match.group(4))
+            continue
+        arg = arg.strip()
+        if len(arg) >= 2 and arg[0] == arg[-1] and arg[0] in "\"'":
+            arg = arg[1:-1]
+        deps.append(arg)
+    return deps
+
+
+def classify_dependencies(deps: Iterable[str], categories: DependencyCategories) -> Dict[str, List[str]]:
+    buckets: Dict[str, List[str]] = {bucket: [] for bucket, _ in categories}
+    buckets["other"] = []
+    for dep in deps:
+        lowered = dep.lower()
+        for bucket, keywords in categories:
+            if any(keyword in lowered for keyword in keywords):
+                buckets[bucket].append(dep)
+                break
+        else:
+            buckets["other"].append(dep)
+    return buckets
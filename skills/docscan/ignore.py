@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Dependency and tooling trees that never hold project sources, ignored even
+# without a .gitignore; a .docsignore line such as ``!Pods/`` brings one back.
+DEFAULT_IGNORES = ("node_modules/", "Pods/", "kotlin-js-store/")
+GITIGNORE_FILE = ".gitignore"
+DOCS_IGNORE_FILE = ".docsignore"
+GIT_EXCLUDE_FILE = os.path.join(".git", "info", "exclude")
+
+# Consecutive patterns with the same (negate, directory only) flags are
+# joined into one regex: (regex, negate, directory only).
+Segment = Tuple[Pattern, bool, bool]
+# Segments of one ignore file, with the directory prefix they are relative to.
+RuleSet = Tuple[str, List[Segment]]
+
+
+def translate_glob(pattern: str) -> str:
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**", index) and (index == 0 or pattern[index - 1] == "/"):
+            rest = index + 2
+            if rest == len(pattern):
+                parts.append(".*")
+                index = rest
+                continue
+            if pattern[rest] == "/":
+                parts.append("(?:.*/)?")
+                index = rest + 1
+                continue
+        if char == "*":
+            parts.append("[^/]*")
+            while index + 1 < len(pattern) and pattern[index + 1] == "*":
+                index += 1
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1:end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def parse_pattern(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """Translate one gitignore line into (regex, negate, directory only)."""
+    line = line.rstrip("\r\n")
+    if not line or line.startswith("#"):
+        return None
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to its file's directory.
+    anchored = "/" in line
+    regex = translate_glob(line.lstrip("/"))
+    return (regex if anchored else "(?:.*/)?" + regex), negate, dir_only
+
+
+def compile_rules(lines: Iterable[str]) -> List[Segment]:
+    segments: List[Segment] = []
+    run: List[str] = []
+    flags = None
+    for line in lines:
+        parsed = parse_pattern(line)
+        if parsed is None:
+            continue
+        regex, negate, dir_only = parsed
+        if run and flags != (negate, dir_only):
+            segments.append((re.compile("|".join(run)), *flags))
+            run = []
+        run.append(f"(?:{regex})")
+        flags = (negate, dir_only)
+    if run:
+        segments.append((re.compile("|".join(run)), *flags))
+    return segments
+
+
+def read_lines(path: str) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+class IgnoreRules:
+    """gitignore matching for one project tree, without calling git.
+
+    Rules are applied in increasing precedence: DEFAULT_IGNORES and
+    ``.git/info/exclude``, every ``.gitignore`` from the root down to the
+    path's directory, then the project's ``.docsignore``. The last matching
+    pattern wins and ``!`` re-includes. Paths are relative to ``root`` and
+    use ``/`` separators; ``.gitignore`` files above ``root`` are not read.
+    """
+
+    def __init__(self, root: str, use_gitignore: bool = True) -> None:
+        self.root = root
+        self.use_gitignore = use_gitignore
+        head = list(DEFAULT_IGNORES)
+        if use_gitignore:
+            head += read_lines(os.path.join(root, GIT_EXCLUDE_FILE))
+        self.head: List[RuleSet] = [("", compile_rules(head))]
+        self.tail: List[RuleSet] = [("", compile_rules(read_lines(os.path.join(root, DOCS_IGNORE_FILE))))]
+        self.chains: Dict[str, Tuple[RuleSet, ...]] = {}
+        self.rules: Dict[str, List[RuleSet]] = {}
+        self.ignored_dirs: Dict[str, bool] = {}
+
+    def gitignore_chain(self, rel_dir: str) -> Tuple[RuleSet, ...]:
+        chain = self.chains.get(rel_dir)
+        if chain is None:
+            chain = self.gitignore_chain(rel_dir.rpartition("/")[0]) if rel_dir else ()
+            if self.use_gitignore:
+                segments = compile_rules(read_lines(os.path.join(self.root, rel_dir, GITIGNORE_FILE)))
+                if segments:
+                    chain += ((rel_dir + "/" if rel_dir else "", segments),)
+            self.chains[rel_dir] = chain
+        return chain
+
+    def rules_for(self, rel_dir: str) -> List[RuleSet]:
+        rules = self.rules.get(rel_dir)
+        if rules is None:
+            rules = [rule_set for rule_set in (*self.head, *self.gitignore_chain(rel_dir), *self.tail) if rule_set[1]]
+            self.rules[rel_dir] = rules
+        return rules
+
+    def checks_files(self, rel_dir: str) -> bool:
+        """Whether any rule in effect in ``rel_dir`` can match a plain file."""
+        return any(not dir_only for _, segments in self.rules_for(rel_dir) for _, _, dir_only in segments)
+
+    def matches(self, rel_dir: str, rel: str, is_dir: bool) -> bool:
+        """Whether ``rel``, an entry of ``rel_dir``, is ignored by itself."""
+        ignored = False
+        for prefix, segments in self.rules_for(rel_dir):
+            subpath = rel[len(prefix):]
+            for regex, negate, dir_only in segments:
+                if ignored != (not negate) and (is_dir or not dir_only) and regex.fullmatch(subpath):
+                    ignored = not negate
+        return ignored
+
+    def ignored(self, rel: str, is_dir: bool = False) -> bool:
+        """Whether ``rel`` or one of its parent directories is ignored."""
+        if os.sep != "/":
+            rel = rel.replace(os.sep, "/")
+        parent = rel.rpartition("/")[0]
+        return self.dir_ignored(parent) or self.matches(parent, rel, is_dir)
+
+    def dir_ignored(self, rel_dir: str) -> bool:
+        if not rel_dir:
+            return False
+        ignored = self.ignored_dirs.get(rel_dir)
+        if ignored is None:
+            ignored = self.ignored(rel_dir, is_dir=True)
+            self.ignored_dirs[rel_dir] = ignored
+        return ignored
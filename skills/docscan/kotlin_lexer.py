@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+import re
+from typing import Iterator, List, Tuple
+
+CODE = "code"
+STRING = "string"
+LINE_COMMENT = "line_comment"
+BLOCK_COMMENT = "block_comment"
+RAW_STRING = "raw_string"
+
+# Each pattern finds the next character sequence that can change lexer state,
+# so plain runs are skipped inside the regex engine and every search resumes
+# where the previous one ended: the whole pass stays linear in the input.
+CODE_TOKEN_RE = re.compile(r"//|/\*|\"|'|`")
+TEMPLATE_CODE_TOKEN_RE = re.compile(r"//|/\*|\"|'|`|\{|\}")
+# Everything up to the next unescaped quote, newline or ``${``, so a whole
+# string literal without templates is consumed by one match.
+STRING_BODY_RE = re.compile(r"[^\"\\\n$]*(?:(?:\\.|\$(?!\{))[^\"\\\n$]*)*", re.DOTALL)
+RAW_STRING_TOKEN_RE = re.compile(r"\"{3,}|\$\{")
+BLOCK_COMMENT_TOKEN_RE = re.compile(r"/\*|\*/")
+CHAR_LITERAL_RE = re.compile(r"'(?:\\(?:u[0-9a-fA-F]{4}|.)|[^'\\\n])'")
+BACKTICK_NAME_RE = re.compile(r"`[^`\n]*`")
+COMMENT_START_RE = re.compile(r"/(?=[/*])")
+QUOTE_RE = re.compile(r"[\"'`]")
+# A template other than ${...} with nothing inside the lexer reacts to, which
+# could carry lexer state across a line break.
+COMPLEX_TEMPLATE_RE = re.compile(r"\$\{(?![^{}\n\"'`/]*\})")
+
+LEXER_PATTERNS = (
+    CODE_TOKEN_RE,
+    TEMPLATE_CODE_TOKEN_RE,
+    STRING_BODY_RE,
+    RAW_STRING_TOKEN_RE,
+    BLOCK_COMMENT_TOKEN_RE,
+    CHAR_LITERAL_RE,
+    BACKTICK_NAME_RE,
+    COMMENT_START_RE,
+    QUOTE_RE,
+    COMPLEX_TEMPLATE_RE,
+)
+
+Segment = Tuple[str, int, int]
+
+
+def block_comment_end(text: str, start: int) -> int:
+    depth = 0
+    pos = start
+    while True:
+        match = BLOCK_COMMENT_TOKEN_RE.search(text, pos)
+        if match is None:
+            return len(text)
+        depth += 1 if match.group() == "/*" else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+
+def kotlin_segments(text: str, offset: int = 0) -> Iterator[Segment]:
+    """Split Kotlin source into (kind, start, end) spans in one linear pass.
+
+    Kinds are code, string, line_comment and block_comment. String spans
+    include their quotes; the expression inside a ``${...}`` template is
+    reported as code, so comments and nested strings in it are lexed too.
+    Block comments nest, and an unterminated comment or raw string runs to
+    the end of the text. A regular string ends at an unescaped newline.
+    Lexing starts at ``offset``, which must be outside any string or comment.
+    """
+    # Each frame is [kind, brace depth]; the top frame is the current state.
+    stack: List[list] = [[CODE, 0]]
+    start = offset
+    pos = offset
+    size = len(text)
+    while pos < size:
+        frame = stack[-1]
+        kind = frame[0]
+        if kind == CODE:
+            pattern = TEMPLATE_CODE_TOKEN_RE if len(stack) > 1 else CODE_TOKEN_RE
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            token = match.group()
+            at = match.start()
+            if token == "//" or token == "/*":
+                if at > start:
+                    yield CODE, start, at
+                if token == "//":
+                    end = text.find("\n", at)
+                    end = size if end < 0 else end
+                    yield LINE_COMMENT, at, end
+                else:
+                    end = block_comment_end(text, at)
+                    yield BLOCK_COMMENT, at, end
+                start = pos = end
+            elif token == "'":
+                literal = CHAR_LITERAL_RE.match(text, at)
+                pos = literal.end() if literal else at + 1
+            elif token == "`":
+                name = BACKTICK_NAME_RE.match(text, at)
+                pos = name.end() if name else at + 1
+            elif token == "{":
+                frame[1] += 1
+                pos = at + 1
+            elif token == "}":
+                pos = at + 1
+                if frame[1]:
+                    frame[1] -= 1
+                    continue
+                if at > start:
+                    yield CODE, start, at
+                stack.pop()
+                start = at
+            else:
+                if at > start:
+                    yield CODE, start, at
+                raw = text.startswith('"""', at)
+                stack.append([RAW_STRING if raw else STRING, 0])
+                start = at
+                pos = at + (3 if raw else 1)
+            continue
+
+        if kind == STRING:
+            pos = STRING_BODY_RE.match(text, pos).end()
+            char = text[pos] if pos < size else ""
+            if char == "$":
+                pos += 2
+                yield STRING, start, pos
+                stack.append([CODE, 0])
+                start = pos
+            elif char == '"' or char == "\n":
+                # The closing quote belongs to the string, an ending newline does not.
+                if char == '"':
+                    pos += 1
+                yield STRING, start, pos
+                stack.pop()
+                start = pos
+            else:
+                # Unterminated, possibly by a backslash at the very end.
+                pos = size
+                break
+            continue
+
+        match = RAW_STRING_TOKEN_RE.search(text, pos)
+        if match is None:
+            pos = size
+            break
+        pos = match.end()
+        yield STRING, start, pos
+        if match.group() == "${":
+            stack.append([CODE, 0])
+        else:
+            stack.pop()
+        start = pos
+    if size > start:
+        yield (CODE if stack[-1][0] == CODE else STRING), start, size
+
+
+def lines_are_independent(text: str) -> bool:
+    """Whether every line outside block comments starts as plain code.
+
+    Regular strings, character literals and backtick names end on their
+    line; only raw strings, escaped newlines and templates with more than
+    a plain expression inside can carry lexer state to the next one.
+    """
+    return '"""' not in text and "\\\n" not in text and COMPLEX_TEMPLATE_RE.search(text) is None
+
+
+def comment_spans(text: str) -> Iterator[Segment]:
+    """The line_comment and block_comment segments of kotlin_segments(text).
+
+    When lines are independent, only the lines holding ``//`` or ``/*`` are
+    looked at, and only those with a quote or backtick before the marker
+    are lexed, so ordinary sources skip the per-token loop.
+    """
+    if not lines_are_independent(text):
+        for segment in kotlin_segments(text):
+            if segment[0] == LINE_COMMENT or segment[0] == BLOCK_COMMENT:
+                yield segment
+        return
+    size = len(text)
+    pos = 0
+    for match in COMMENT_START_RE.finditer(text):
+        at = match.start()
+        if at < pos:
+            # Inside a comment already yielded or a line already lexed.
+            continue
+        line = text.rfind("\n", pos, at) + 1 or pos
+        if line == at or QUOTE_RE.search(text, line, at) is None:
+            if text[at + 1] == "/":
+                end = text.find("\n", at)
+                end = size if end < 0 else end
+                yield LINE_COMMENT, at, end
+            else:
+                end = block_comment_end(text, at)
+                yield BLOCK_COMMENT, at, end
+            pos = end
+            continue
+        # The marker may sit inside a literal: lex from the line start, which
+        # is plain code, up to the first comment or the end of the line.
+        line_end = text.find("\n", at)
+        pos = size if line_end < 0 else line_end
+        for segment in kotlin_segments(text, line):
+            if segment[0] == LINE_COMMENT or segment[0] == BLOCK_COMMENT:
+                yield segment
+                pos = segment[2]
+                break
+            if segment[2] >= pos:
+                break
+
+
+def strip_kotlin_comments(text: str) -> str:
+    """Return text with comments removed; a block comment becomes one space."""
+    if "//" not in text and "/*" not in text:
+        return text
+    parts = []
+    kept = 0
+    for kind, start, end in comment_spans(text):
+        parts.append(text[kept:start])
+        if kind == BLOCK_COMMENT:
+            parts.append(" ")
+        kept = end
+    parts.append(text[kept:])
+    return "".join(parts)
@@ -0,0 +1,1401 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from types import ModuleType
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .ignore import IgnoreRules
+
+CACHE_DIR_NAME = ".docs-cache"
+# Ignores the whole cache directory, itself included, so it never shows up in git status.
+CACHE_GITIGNORE = "*\n"
+STORE_NAME = "scan"
+STORE_VERSION = 4
+RACY_WINDOW_NS = 2_000_000_000
+MAX_CHUNK_SIZE = 256
+CHUNKS_PER_JOB = 4
+DEFAULT_READERS = 4
+DEFAULT_READ_BUDGET_MB = 64
+READS_PER_READER = 4
+WORST_FILES = 5
+DEFAULT_WATCH_INTERVAL = 1.0
+DEFAULT_WATCH_DEBOUNCE = 0.3
+DEFAULT_MAX_FILE_KB = 512
+GENERATED_HEADER_BYTES = 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+# Generator output by path: generated/ trees under build output (Compose
+# resources, SQLDelight, KSP, kapt) and resource/BuildConfig accessors. A
+# hand-written package that happens to be named generated is still scanned.
+GENERATED_DIR_RE = re.compile(r"(?:^|/)(?:build|composeResources)/generated/")
+GENERATED_ACCESSORS = frozenset(
+    name + extension for name in ("Res", "R", "BuildConfig", "BuildKonfig") for extension in (".kt", ".java")
+)
+GENERATED_HEADER_RE = re.compile(rb"@file:(?:[\w.]+\.)?Generated\b|Code generated|DO NOT (?:EDIT|MODIFY)")
+
+ScanFunction = Callable[[str, Union[str, BinaryIO]], dict]
+AcceptFunction = Callable[[str], bool]
+ScanTask = Tuple[str, str, Optional[str], Tuple[int, ...]]
+ScanOutcome = Tuple[Optional[str], Dict[int, dict], Optional[str]]
+ResultCallback = Callable[[str, Dict[str, dict]], None]
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+class Analyzer(NamedTuple):
+    """A per-file analysis whose results live in the shared result store.
+
+    ``name`` keys the analyzer's result in every file entry, so skills that
+    run the same analyzer reuse each other's results. Changing ``schema``
+    drops the stored results of that analyzer. Source analyzers set
+    ``skip_generated`` so generator output and oversized files are not
+    parsed; the check runs only when every analyzer of a scan sets it.
+    With ``streams`` the scan function gets the file opened in binary mode
+    instead of its decoded text; when every analyzer of a scan streams,
+    files are hashed and parsed in chunks and never held whole in memory.
+    """
+
+    name: str
+    schema: str
+    scan: ScanFunction
+    skip_generated: bool = False
+    streams: bool = False
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.events: List[dict] = []
+        self.stack: List[dict] = []
+        self.origin = 0.0
+        self.peak = 0
+
+    def start(self) -> None:
+        # tracemalloc, subprocess and concurrent.futures are imported where they
+        # are used: entry points that never profile, call git or fan out (--help,
+        # query, warm runs) skip most of their import cost.
+        import tracemalloc
+
+        self.enabled = True
+        self.origin = time.perf_counter()
+        tracemalloc.start()
+
+    def totals(self, name: str) -> Dict[str, float]:
+        return self.phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "files": 0, "bytes": 0})
+
+    @contextmanager
+    def phase(self, name: str, **args: object) -> Iterator[None]:
+        import tracemalloc
+
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = {"peak": 0, "wall": time.perf_counter(), "cpu": time.process_time()}
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            wall = time.perf_counter() - frame["wall"]
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            if self.stack:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+            self.peak = max(self.peak, peak)
+            with self.lock:
+                totals = self.totals(name)
+                totals["calls"] += 1
+                totals["wall"] += wall
+                totals["cpu"] += time.process_time() - frame["cpu"]
+                totals["peak"] = max(totals.get("peak", 0), peak)
+                self.events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": (frame["wall"] - self.origin) * 1e6,
+                        "dur": wall * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": {**args, "peak_bytes": peak},
+                    }
+                )
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            with self.lock:
+                totals = self.totals(name)
+                totals["calls"] += 1
+                totals["wall"] += time.perf_counter() - wall
+                totals["cpu"] += time.thread_time() - cpu
+
+    def count(self, name: str, files: int = 0, size: int = 0) -> None:
+        with self.lock:
+            totals = self.totals(name)
+            totals["files"] += files
+            totals["bytes"] += size
+
+    def report(self) -> Dict[str, Any]:
+        import tracemalloc
+
+        return {
+            "wall": time.perf_counter() - self.origin,
+            "cpu": time.process_time(),
+            "peak_bytes": max(self.peak, tracemalloc.get_traced_memory()[1]),
+            "phases": {name: dict(totals) for name, totals in self.phases.items()},
+        }
+
+
+PROFILER = Profiler()
+
+
+class PatternStats:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.local = threading.local()
+        self.patterns: Dict[str, Dict[str, Any]] = {}
+
+    def current_file(self) -> str:
+        return getattr(self.local, "rel", None) or "<aggregate>"
+
+    def record(self, name: str, elapsed: float, size: int, hits: int) -> None:
+        stats = self.patterns.setdefault(name, {"calls": 0, "time": 0.0, "bytes": 0, "hits": 0, "files": {}})
+        stats["calls"] += 1
+        stats["time"] += elapsed
+        stats["bytes"] += size
+        stats["hits"] += hits
+        rel = self.current_file()
+        stats["files"][rel] = stats["files"].get(rel, 0.0) + elapsed
+
+    def report(self) -> Dict[str, Any]:
+        patterns = {}
+        for name, stats in sorted(self.patterns.items(), key=lambda item: -item[1]["time"]):
+            worst = sorted(stats["files"].items(), key=lambda item: -item[1])[:WORST_FILES]
+            patterns[name] = {
+                "calls": stats["calls"],
+                "time": stats["time"],
+                "bytes": stats["bytes"],
+                "hits": stats["hits"],
+                "worst_files": [{"path": rel, "time": elapsed} for rel, elapsed in worst],
+            }
+        return {"patterns": patterns}
+
+
+PATTERN_STATS = PatternStats()
+
+
+class ProfiledPattern:
+    def __init__(self, name: str, compiled: "re.Pattern[str]") -> None:
+        self.name = name
+        self.compiled = compiled
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.compiled, attribute)
+
+    def timed(self, method: str, string: str, args: tuple, kwargs: dict, hits: Callable[[Any], int]) -> Any:
+        start = time.perf_counter()
+        result = getattr(self.compiled, method)(string, *args, **kwargs)
+        PATTERN_STATS.record(self.name, time.perf_counter() - start, len(string), hits(result))
+        return result
+
+    def search(self, string: str, *args: Any, **kwargs: Any) -> Any:
+        return self.timed("search", string, args, kwargs, lambda result: int(result is not None))
+
+    def match(self, string: str, *args: Any, **kwargs: Any) -> Any:
+        return self.timed("match", string, args, kwargs, lambda result: int(result is not None))
+
+    def fullmatch(self, string: str, *args: Any, **kwargs: Any) -> Any:
+        return self.timed("fullmatch", string, args, kwargs, lambda result: int(result is not None))
+
+    def findall(self, string: str, *args: Any, **kwargs: Any) -> Any:
+        return self.timed("findall", string, args, kwargs, len)
+
+    def split(self, string: str, *args: Any, **kwargs: Any) -> Any:
+        return self.timed("split", string, args, kwargs, lambda result: len(result) - 1)
+
+    def finditer(self, string: str, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        elapsed = 0.0
+        hits = 0
+        start = time.perf_counter()
+        matches = self.compiled.finditer(string, *args, **kwargs)
+        try:
+            while True:
+                try:
+                    found = next(matches)
+                except StopIteration:
+                    break
+                elapsed += time.perf_counter() - start
+                hits += 1
+                yield found
+                start = time.perf_counter()
+        finally:
+            elapsed += time.perf_counter() - start
+            PATTERN_STATS.record(self.name, elapsed, len(string), hits)
+
+    def subn(self, repl: Any, string: str, *args: Any, **kwargs: Any) -> Tuple[str, int]:
+        start = time.perf_counter()
+        result = self.compiled.subn(repl, string, *args, **kwargs)
+        PATTERN_STATS.record(self.name, time.perf_counter() - start, len(string), result[1])
+        return result
+
+    def sub(self, repl: Any, string: str, *args: Any, **kwargs: Any) -> str:
+        return self.subn(repl, string, *args, **kwargs)[0]
+
+
+def profile_pattern(name: str, value: Any) -> Any:
+    if isinstance(value, re.Pattern):
+        return ProfiledPattern(name, value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = profile_pattern(f"{name}[{key}]", item)
+    return value
+
+
+def instrument_patterns(*modules: ModuleType) -> None:
+    for module in modules:
+        prefix = os.path.splitext(os.path.basename(getattr(module, "__file__", "") or module.__name__))[0]
+        for attribute, value in list(vars(module).items()):
+            if attribute.isupper():
+                setattr(module, attribute, profile_pattern(f"{prefix}.{attribute}", value))
+
+
+@contextmanager
+def pattern_file(rel: str) -> Iterator[None]:
+    previous = getattr(PATTERN_STATS.local, "rel", None)
+    PATTERN_STATS.local.rel = rel
+    try:
+        yield
+    finally:
+        PATTERN_STATS.local.rel = previous
+
+
+def format_pattern_report(report: Dict[str, Any]) -> str:
+    lines = ["Pattern cost:"]
+    for name, stats in report["patterns"].items():
+        lines.append(
+            f"  {name:48} {stats['time']:8.3f}s {stats['calls']:8d} calls "
+            f"{stats['bytes'] / 1048576:9.1f} MiB {stats['hits']:8d} hits"
+        )
+        for worst in stats["worst_files"][:1]:
+            lines.append(f"  {'':48} worst: {worst['path']} ({worst['time'] * 1000:.1f} ms)")
+    return "\n".join(lines)
+
+
+def profile_phase(name: str, **args: object):
+    return PROFILER.phase(name, **args) if PROFILER.enabled else nullcontext()
+
+
+def profile_measure(name: str):
+    return PROFILER.measure(name) if PROFILER.enabled else nullcontext()
+
+
+def pattern_scope(rel: str):
+    return pattern_file(rel) if PATTERN_STATS.enabled else nullcontext()
+
+
+def profile_count(name: str, files: int = 0, size: int = 0) -> None:
+    if PROFILER.enabled:
+        PROFILER.count(name, files, size)
+
+
+def start_profiling(args: argparse.Namespace, modules: Iterable[ModuleType] = ()) -> None:
+    if args.profile or args.profile_trace:
+        PROFILER.start()
+    if args.profile_regex:
+        PATTERN_STATS.enabled = True
+        instrument_patterns(*modules)
+
+
+def finish_profiling(args: argparse.Namespace) -> None:
+    if PATTERN_STATS.enabled:
+        report = PATTERN_STATS.report()
+        with open(args.profile_regex, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(format_pattern_report(report))
+    if not PROFILER.enabled:
+        return
+    if args.profile:
+        with open(args.profile, "w", encoding="utf-8") as f:
+            json.dump(PROFILER.report(), f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.profile_trace:
+        with open(args.profile_trace, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": PROFILER.events, "displayTimeUnit": "ms"}, f)
+    print(format_profile(PROFILER.report()))
+
+
+def format_profile(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Profile: {report['wall']:.3f}s wall, {report['cpu']:.3f}s cpu, "
+        f"peak {report['peak_bytes'] / 1048576:.1f} MiB"
+    ]
+    for name, totals in sorted(report["phases"].items(), key=lambda item: -item[1]["wall"]):
+        line = f"  {name:24} {totals['wall']:8.3f}s wall {totals['cpu']:8.3f}s cpu {totals['calls']:7d} calls"
+        if totals["files"] or totals["bytes"]:
+            line += f" {totals['files']:7d} files {totals['bytes'] / 1048576:8.1f} MiB"
+        if "peak" in totals:
+            line += f"  peak {totals['peak'] / 1048576:.1f} MiB"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def schema_key(version: int, *parts: object) -> str:
+    digest = hashlib.sha1(f"v{version}".encode("utf-8"))
+    for part in parts:
+        if hasattr(part, "pattern"):
+            part = f"{part.pattern}/{part.flags}"
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_source(path: str) -> Optional[bytes]:
+    with profile_measure("read"):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+    profile_count("read", 1, len(data))
+    return data
+
+
+def decode_source(data: bytes) -> str:
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def relative_to(path: str, root: str) -> str:
+    """os.path.relpath(path, root), sliced directly when ``path`` is under ``root``.
+
+    relpath normalizes both arguments on every call, which adds up when it
+    runs once per file; paths produced by walking ``root`` need none of it.
+    """
+    prefix = os.path.join(root, "")
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return os.path.relpath(path, root)
+
+
+def cache_path(project_root: str, name: str) -> str:
+    return os.path.join(project_root, CACHE_DIR_NAME, name + ".json")
+
+
+def empty_store() -> Dict[str, Any]:
+    return {"version": STORE_VERSION, "analyzers": {}, "git": {}, "files": {}}
+
+
+def forget_results(store: Dict[str, Any], names: Iterable[str]) -> None:
+    names = set(names)
+    files = store["files"]
+    for rel in list(files):
+        results = files[rel]["results"]
+        for name in names.intersection(results):
+            del results[name]
+        if not results:
+            del files[rel]
+    for key in list(store["git"]):
+        if key.partition(":")[0] in names:
+            del store["git"][key]
+
+
+def load_result_store(project_root: str, analyzers: List[Analyzer]) -> Dict[str, Any]:
+    """Load ``.docs-cache/scan.json``, the per-file results all skills share.
+
+    Every file entry records the size, mtime and SHA-1 its results were
+    computed from and one result per analyzer name; a file whose content
+    changes loses the results of every analyzer, not only the one that
+    noticed. Results stored under another schema are dropped here.
+    """
+    try:
+        with open(cache_path(project_root, STORE_NAME), "r", encoding="utf-8") as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        store = None
+    if not isinstance(store, dict) or store.get("version") != STORE_VERSION:
+        store = empty_store()
+    register_analyzers(store, analyzers)
+    return store
+
+
+def register_analyzers(store: Dict[str, Any], analyzers: List[Analyzer]) -> bool:
+    """Record the analyzers' schemas; returns whether stored results were dropped."""
+    stale = [analyzer.name for analyzer in analyzers if store["analyzers"].get(analyzer.name) != analyzer.schema]
+    if stale:
+        forget_results(store, stale)
+    for analyzer in analyzers:
+        store["analyzers"][analyzer.name] = analyzer.schema
+    return bool(stale)
+
+
+def temporary_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def replace_file(tmp_path: str, path: str) -> None:
+    try:
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+    except OSError:
+        pass
+    os.replace(tmp_path, path)
+
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    tmp_path = temporary_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        replace_file(tmp_path, path)
+    except OSError:
+        remove_quietly(tmp_path)
+        raise
+
+
+def file_digest(path: str) -> Optional[str]:
+    data = read_source(path)
+    return hashlib.sha1(data).hexdigest() if data is not None else None
+
+
+def write_if_changed(path: str, content: Union[str, bytes]) -> bool:
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        unchanged = os.path.getsize(path) == len(data) and file_digest(path) == hashlib.sha1(data).hexdigest()
+    except OSError:
+        unchanged = False
+    if unchanged:
+        return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write(path, data)
+    return True
+
+
+class OutputStream:
+    """Write a generated file piece by piece without building it in memory.
+
+    Content goes to a temporary file next to ``path`` while its digest is
+    computed. On close the file replaces ``path`` only if the bytes differ,
+    as in write_if_changed; ``changed`` records which case happened.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.tmp_path = temporary_path(path)
+        self.file = open(self.tmp_path, "wb")
+        self.digest = hashlib.sha1()
+        self.size = 0
+        self.changed = False
+
+    def __enter__(self) -> "OutputStream":
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            remove_quietly(self.tmp_path)
+
+    def write(self, content: Union[str, bytes]) -> None:
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self.file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def close(self) -> bool:
+        self.file.close()
+        try:
+            unchanged = os.path.getsize(self.path) == self.size and file_digest(self.path) == self.digest.hexdigest()
+        except OSError:
+            unchanged = False
+        if unchanged:
+            remove_quietly(self.tmp_path)
+        else:
+            try:
+                replace_file(self.tmp_path, self.path)
+            except OSError:
+                remove_quietly(self.tmp_path)
+                raise
+        self.changed = not unchanged
+        return self.changed
+
+
+def write_outputs(outputs: Dict[str, Union[str, bytes]]) -> Tuple[List[str], List[str]]:
+    written = []
+    unchanged = []
+    with profile_phase("write", files=len(outputs)):
+        for path, content in outputs.items():
+            (written if write_if_changed(path, content) else unchanged).append(path)
+    profile_count("write", len(written), sum(len(outputs[path]) for path in written))
+    return written, unchanged
+
+
+def format_write_summary(written: List[str], unchanged: List[str]) -> str:
+    return f"Written: {len(written)}, unchanged: {len(unchanged)}."
+
+
+def format_generated_summary() -> str:
+    return f"Skipped as generated: {len(GENERATED_SKIPS)} file(s), {sum(GENERATED_SKIPS.values()) / 1048576:.1f} MiB."
+
+
+def save_result_store(project_root: str, store: Dict[str, Any]) -> None:
+    path = cache_path(project_root, STORE_NAME)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        gitignore = os.path.join(os.path.dirname(path), ".gitignore")
+        if not os.path.exists(gitignore):
+            atomic_write(gitignore, CACHE_GITIGNORE.encode("utf-8"))
+        atomic_write(path, json.dumps(store, separators=(",", ":")).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def prune_vanished(store_root: str, files: Dict[str, dict], names: Iterable[str], visited: Set[str]) -> bool:
+    """Drop entries holding ``names`` results whose file is gone.
+
+    Scans without ``accept`` cannot tell which stored files left them, so
+    every entry they did not visit is checked on disk.
+    """
+    names = set(names)
+    vanished = [
+        rel
+        for rel, entry in files.items()
+        if rel not in visited
+        and not names.isdisjoint(entry["results"])
+        and not os.path.exists(os.path.join(store_root, rel))
+    ]
+    for rel in vanished:
+        del files[rel]
+    return bool(vanished)
+
+
+class StoreSession:
+    """Result stores shared by the analyze_files calls of one run.
+
+    Each store is loaded on first use and saved once when the session
+    ends, and only if one of the calls changed it. Vanished files are
+    pruned for scans without ``accept`` against every path the session
+    visited, not once per call.
+    """
+
+    def __init__(self) -> None:
+        self.stores: Dict[str, Dict[str, Any]] = {}
+        self.changed: Set[str] = set()
+        self.visited: Dict[str, Set[str]] = {}
+        self.unscoped: Dict[str, Set[str]] = {}
+
+    def load(self, store_root: str, analyzers: List[Analyzer]) -> Dict[str, Any]:
+        store = self.stores.get(store_root)
+        if store is None:
+            store = self.stores[store_root] = load_result_store(store_root, analyzers)
+            self.visited[store_root] = set()
+            self.unscoped[store_root] = set()
+        elif register_analyzers(store, analyzers):
+            self.changed.add(store_root)
+        return store
+
+    def save(self) -> None:
+        for store_root, store in self.stores.items():
+            names = self.unscoped[store_root]
+            if names and prune_vanished(store_root, store["files"], names, self.visited[store_root]):
+                self.changed.add(store_root)
+            if store_root in self.changed:
+                with profile_phase("cache save"):
+                    save_result_store(store_root, store)
+
+
+STORE_SESSION: Optional[StoreSession] = None
+# Size of each file skipped as generator output this run, by (store root, path).
+GENERATED_SKIPS: Dict[Tuple[str, str], int] = {}
+
+
+@contextmanager
+def shared_result_store() -> Iterator[None]:
+    """Load each result store once and save it once for the scans within.
+
+    Nested uses join the outermost session. Nothing is saved when the
+    block raises.
+    """
+    global STORE_SESSION
+    if STORE_SESSION is not None:
+        yield
+        return
+    session = STORE_SESSION = StoreSession()
+    try:
+        yield
+    finally:
+        STORE_SESSION = None
+    session.save()
+
+
+def run_git(project_root: str, *args: str) -> Optional[bytes]:
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "-C", project_root, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout
+
+
+def git_paths(project_root: str, *args: str) -> Optional[Set[str]]:
+    output = run_git(project_root, *args)
+    if output is None:
+        return None
+    names = output.decode("utf-8", errors="surrogateescape").split("\0")
+    return {os.path.normpath(name) for name in names if name}
+
+
+def git_head(project_root: str) -> Optional[str]:
+    output = run_git(project_root, "rev-parse", "--verify", "-q", "HEAD")
+    return output.decode("ascii").strip() if output else None
+
+
+def git_changed_paths(project_root: str, base: Optional[str], staged: bool) -> Optional[Set[str]]:
+    if staged:
+        return git_paths(project_root, "diff", "--cached", "--name-only", "--relative", "--no-renames", "-z")
+    if not base:
+        return None
+    changed = git_paths(project_root, "diff", "--name-only", "--relative", "--no-renames", "-z", base)
+    untracked = git_paths(project_root, "ls-files", "--others", "--exclude-standard", "-z")
+    if changed is None or untracked is None:
+        return None
+    return changed | untracked
+
+
+def git_dirty_paths(project_root: str, rels: Iterable[str]) -> Optional[List[str]]:
+    tracked = git_paths(project_root, "ls-files", "-z")
+    changed = git_changed_paths(project_root, "HEAD", staged=False)
+    if tracked is None or changed is None:
+        return None
+    return sorted(rel for rel in rels if rel in changed or rel not in tracked)
+
+
+def add_scan_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for scanning (0 = all cores).")
+    parser.add_argument(
+        "--readers",
+        type=int,
+        default=DEFAULT_READERS,
+        help=f"Threads reading files ahead of the parser (default {DEFAULT_READERS}, 1 = sequential reads).",
+    )
+    parser.add_argument(
+        "--read-budget-mb",
+        type=int,
+        default=DEFAULT_READ_BUDGET_MB,
+        help=f"Maximum MiB of file contents held by read-ahead (default {DEFAULT_READ_BUDGET_MB}).",
+    )
+    parser.add_argument(
+        "--max-file-kb",
+        type=int,
+        default=DEFAULT_MAX_FILE_KB,
+        help=f"Treat larger sources as generated and skip them unread (default {DEFAULT_MAX_FILE_KB}, 0 = no limit).",
+    )
+    git_group = parser.add_mutually_exclusive_group()
+    git_group.add_argument(
+        "--since",
+        metavar="REV",
+        help="Rescan only files changed since REV (plus untracked files); reuse cached results for the rest.",
+    )
+    git_group.add_argument(
+        "--staged",
+        action="store_true",
+        help="Rescan only files staged in git; reuse cached results for the rest.",
+    )
+    git_group.add_argument(
+        "--no-git",
+        action="store_true",
+        help="Always walk the tree instead of asking git which files changed.",
+    )
+
+
+def scan_options_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "jobs": 1 if getattr(args, "profile_regex", None) else args.jobs,
+        "refresh": bool(getattr(args, "profile_regex", None)),
+        "readers": args.readers,
+        "read_budget": max(1, args.read_budget_mb) * 1024 * 1024,
+        "max_file_size": max(0, args.max_file_kb) * 1024,
+        "since": args.since,
+        "staged": args.staged,
+        "use_git": not args.no_git,
+    }
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        metavar="REPORT",
+        help="Record per-phase wall/CPU time, files, bytes and tracemalloc peak into a JSON report.",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        metavar="TRACE",
+        help="Also write a Chrome trace-event file (chrome://tracing, Perfetto).",
+    )
+    parser.add_argument(
+        "--profile-regex",
+        metavar="REPORT",
+        help=(
+            "Time every compiled pattern (calls, time, bytes, hits, worst files) into a JSON report. "
+            "Implies --jobs 1 and rescans every file."
+        ),
+    )
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--watch", action="store_true", help="Keep running and regenerate when sources change.")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Seconds between polls in watch mode (default {DEFAULT_WATCH_INTERVAL}).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_WATCH_DEBOUNCE,
+        help=f"Quiet seconds required before a change burst is processed (default {DEFAULT_WATCH_DEBOUNCE}).",
+    )
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def read_ahead(
+    tasks: List[Tuple[str, int]],
+    readers: int,
+    budget: int,
+) -> Iterator[Tuple[int, Optional[bytes]]]:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    inflight = {}
+    inflight_bytes = 0
+    next_index = 0
+    max_inflight = readers * READS_PER_READER
+    with ThreadPoolExecutor(max_workers=readers) as pool:
+        while next_index < len(tasks) or inflight:
+            while next_index < len(tasks) and len(inflight) < max_inflight:
+                path, size = tasks[next_index]
+                if inflight and inflight_bytes + size > budget:
+                    break
+                inflight[pool.submit(read_source, path)] = (next_index, size)
+                inflight_bytes += size
+                next_index += 1
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, size = inflight.pop(future)
+                inflight_bytes -= size
+                yield index, future.result()
+
+
+def generated_reason(rel: str, size: int, max_file_size: int) -> Optional[str]:
+    """Why a file is treated as generator output before reading it, if it is."""
+    rel = rel.replace(os.sep, "/") if os.sep != "/" else rel
+    # The substring test keeps the regex off the common path, where it costs
+    # more per file than the rest of planning.
+    if "generated/" in rel and GENERATED_DIR_RE.search(rel) or rel.rpartition("/")[2] in GENERATED_ACCESSORS:
+        return "path"
+    if max_file_size and size > max_file_size:
+        return "size"
+    return None
+
+
+def skipped_results(analyzers: List[Analyzer], rel: str, run: Iterable[int]) -> Dict[int, dict]:
+    # What each analyzer reports for an empty file, as for unreadable ones.
+    return {index: analyzers[index].scan(rel, io.BytesIO() if analyzers[index].streams else "") for index in run}
+
+
+def generated_header(rel: str, analyzers: List[Analyzer], head: bytes) -> Optional[str]:
+    if not all(analyzer.skip_generated for analyzer in analyzers):
+        return None
+    generated = generated_reason(rel, 0, 0)
+    if generated is None and GENERATED_HEADER_RE.search(head, 0, GENERATED_HEADER_BYTES):
+        generated = "header"
+    return generated
+
+
+def scan_data(
+    analyzers: List[Analyzer],
+    rel: str,
+    known_digest: Optional[str],
+    missing: Tuple[int, ...],
+    data: Optional[bytes],
+) -> ScanOutcome:
+    if data is None:
+        return None, skipped_results(analyzers, rel, range(len(analyzers))), None
+    digest = hashlib.sha1(data).hexdigest()
+    generated = generated_header(rel, analyzers, data)
+    # Unchanged content only needs the analyzers the entry has no result for.
+    run = missing if digest == known_digest else range(len(analyzers))
+    if not run:
+        return digest, {}, generated
+    if generated:
+        return digest, skipped_results(analyzers, rel, run), generated
+    with profile_measure("parse"), pattern_scope(rel):
+        text = decode_source(data)
+        results = {
+            index: analyzers[index].scan(rel, io.BytesIO(data) if analyzers[index].streams else text) for index in run
+        }
+    profile_count("parse", 1, len(data))
+    return digest, results, None
+
+
+def scan_stream(
+    analyzers: List[Analyzer],
+    rel: str,
+    known_digest: Optional[str],
+    missing: Tuple[int, ...],
+    path: str,
+) -> ScanOutcome:
+    """scan_data for analyzers that all stream: the file is hashed, then parsed, in chunks."""
+    try:
+        with open(path, "rb") as f:
+            with profile_measure("read"):
+                hasher = hashlib.sha1()
+                head = f.read(STREAM_CHUNK_SIZE)
+                size = len(head)
+                hasher.update(head)
+                for chunk in iter(partial(f.read, STREAM_CHUNK_SIZE), b""):
+                    size += len(chunk)
+                    hasher.update(chunk)
+            profile_count("read", 1, size)
+            digest = hasher.hexdigest()
+            generated = generated_header(rel, analyzers, head)
+            run = missing if digest == known_digest else range(len(analyzers))
+            if not run:
+                return digest, {}, generated
+            if generated:
+                return digest, skipped_results(analyzers, rel, run), generated
+            results = {}
+            with profile_measure("parse"), pattern_scope(rel):
+                for index in run:
+                    f.seek(0)
+                    results[index] = analyzers[index].scan(rel, f)
+    except OSError:
+        return None, skipped_results(analyzers, rel, range(len(analyzers))), None
+    profile_count("parse", 1, size)
+    return digest, results, None
+
+
+def scan_task(analyzers: List[Analyzer], task: ScanTask) -> ScanOutcome:
+    path, rel, known_digest, missing = task
+    if all(analyzer.streams for analyzer in analyzers):
+        return scan_stream(analyzers, rel, known_digest, missing, path)
+    return scan_data(analyzers, rel, known_digest, missing, read_source(path))
+
+
+def scan_chunk(analyzers: List[Analyzer], tasks: List[ScanTask]) -> List[ScanOutcome]:
+    return [scan_task(analyzers, task) for task in tasks]
+
+
+def chunk_tasks(tasks: List[ScanTask], jobs: int) -> List[List[ScanTask]]:
+    size = max(1, min(MAX_CHUNK_SIZE, len(tasks) // (jobs * CHUNKS_PER_JOB)))
+    return [tasks[start:start + size] for start in range(0, len(tasks), size)]
+
+
+def run_scan_tasks(
+    analyzers: List[Analyzer],
+    tasks: List[ScanTask],
+    sizes: List[int],
+    jobs: int,
+    readers: int,
+    read_budget: int,
+) -> Iterator[ScanOutcome]:
+    """Yield the outcome of each task in task order as soon as it is known."""
+    chunks = chunk_tasks(tasks, jobs) if jobs > 1 else []
+    if len(chunks) >= 2:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            for outcomes in pool.map(partial(scan_chunk, analyzers), chunks):
+                yield from outcomes
+        return
+    if readers <= 1 or len(tasks) < 2 or all(analyzer.streams for analyzer in analyzers):
+        # Streaming analyzers read their files in chunks, so there is nothing to read ahead.
+        for task in tasks:
+            yield scan_task(analyzers, task)
+        return
+    # Reads complete out of order; outcomes wait here until their turn, which
+    # the read-ahead window bounds.
+    ready: Dict[int, ScanOutcome] = {}
+    next_index = 0
+    reads = [(path, size) for (path, _, _, _), size in zip(tasks, sizes)]
+    for index, data in read_ahead(reads, readers, read_budget):
+        _, rel, known_digest, missing = tasks[index]
+        ready[index] = scan_data(analyzers, rel, known_digest, missing, data)
+        while next_index in ready:
+            yield ready.pop(next_index)
+            next_index += 1
+
+
+def plan_scan(
+    store_root: str,
+    paths: Iterable[str],
+    files: Dict[str, dict],
+    names: List[str],
+    changed: Optional[Set[str]],
+    skip_generated: bool = False,
+    max_file_size: int = 0,
+) -> Tuple[Dict[str, Optional[dict]], list, list, Set[str]]:
+    results: Dict[str, Optional[dict]] = {}
+    pending = []
+    skipped = []
+    visited: Set[str] = set()
+    everything = tuple(range(len(names)))
+    for path in paths:
+        rel = relative_to(path, store_root)
+        entry = files.get(rel)
+        if entry is None:
+            missing = everything
+        else:
+            missing = tuple(index for index, name in enumerate(names) if name not in entry["results"])
+        if changed is not None and rel not in changed and entry is not None and not missing:
+            visited.add(rel)
+            results[path] = entry["results"]
+            continue
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            # The file is gone, so no analyzer's result for it is valid.
+            files.pop(rel, None)
+            continue
+        except OSError:
+            stat_result = None
+        visited.add(rel)
+        results[path] = None
+        if stat_result is None:
+            pending.append((path, rel, None, None, everything))
+            continue
+        # Keep only what the store needs: a full stat_result per pending file
+        # costs hundreds of bytes and is held until the whole scan finishes.
+        stat = (stat_result.st_size, stat_result.st_mtime_ns)
+        reason = generated_reason(rel, stat[0], max_file_size) if skip_generated else None
+        if reason:
+            # Skipped without reading; a stored entry is kept if it was skipped the same way.
+            same = entry is not None and entry.get("generated") == reason
+            if same and not missing and entry["size"] == stat[0] and entry["mtime"] == stat[1]:
+                results[path] = entry["results"]
+            else:
+                skipped.append((path, rel, stat, entry if same else None, missing if same else everything, reason))
+            continue
+        if (
+            entry is not None
+            and not missing
+            and entry["size"] == stat[0]
+            and entry["mtime"] == stat[1]
+            and entry.get("generated") in (None, "header")
+        ):
+            results[path] = entry["results"]
+            continue
+        pending.append((path, rel, stat, entry, missing))
+    return results, pending, skipped, visited
+
+
+def git_changed_since(project_root: str, bases: Set[str], staged: bool) -> Optional[Set[str]]:
+    changed: Set[str] = set()
+    for base in sorted(bases):
+        paths = git_changed_paths(project_root, base, staged=False)
+        if paths is None:
+            return None
+        changed.update(paths)
+    if staged:
+        paths = git_changed_paths(project_root, None, staged=True)
+        if paths is None:
+            return None
+        changed.update(paths)
+    return changed
+
+
+def analyze_files(
+    project_root: str,
+    paths: Iterable[str],
+    analyzers: List[Analyzer],
+    jobs: int = 1,
+    readers: int = DEFAULT_READERS,
+    read_budget: int = DEFAULT_READ_BUDGET_MB * 1024 * 1024,
+    accept: Optional[AcceptFunction] = None,
+    scope: str = "",
+    since: Optional[str] = None,
+    staged: bool = False,
+    use_git: bool = True,
+    refresh: bool = False,
+    cache_root: Optional[str] = None,
+    max_file_size: int = DEFAULT_MAX_FILE_KB * 1024,
+    on_result: Optional[ResultCallback] = None,
+) -> Dict[str, Dict[str, dict]]:
+    """Run every analyzer over ``paths`` in one read of each file.
+
+    Returns ``{path: {analyzer name: result}}``. Results come from the
+    shared store when the file is unchanged, including results another
+    skill stored. With ``accept`` and a git checkout, only files git
+    reports as changed since the recorded HEAD are looked at; ``scope``
+    keeps that record apart for callers that scan disjoint subsets of the
+    project with the same analyzers. ``cache_root``, a directory containing
+    ``project_root``, holds the store instead so that nested projects
+    share it; store keys are then relative to it.
+
+    When every analyzer sets ``skip_generated``, generator output (by
+    path, by a generated-code header in the first bytes, or larger than
+    ``max_file_size``) is not parsed: every analyzer
+    gets its result for an empty file, and path or size matches are not
+    even read. The profile's ``generated`` line counts those files and
+    bytes, and format_generated_summary() reports them for the whole run.
+
+    ``on_result(path, file results)`` is called for each file in ``paths``
+    order as soon as its results are known, while later files are still
+    being scanned, so callers can stream output instead of waiting for the
+    returned dict.
+
+    Inside shared_result_store() the store is loaded and saved once for
+    all the calls of the block instead of once per call.
+    """
+    store_root = cache_root or project_root
+    prefix = os.path.relpath(project_root, store_root)
+    prefix = "" if prefix == os.curdir else prefix + os.sep
+
+    def in_project(rel: str) -> bool:
+        return rel.startswith(prefix) and accept(rel[len(prefix):])
+
+    names = [analyzer.name for analyzer in analyzers]
+    label = ",".join(names)
+    session = STORE_SESSION
+    with profile_phase("cache load", cache=label):
+        store = session.load(store_root, analyzers) if session else load_result_store(store_root, analyzers)
+    if refresh:
+        forget_results(store, names)
+    files = store["files"]
+    git_keys = [f"{name}:{prefix}{scope}" if prefix or scope else name for name in names]
+    git_states = [store["git"].get(key) for key in git_keys]
+    head = git_head(project_root) if accept is not None and use_git else None
+    changed = None
+    if head and files and all(git_states):
+        # The recorded heads are always bases: --since and --staged only add
+        # files, otherwise commits made since the last run would be missed
+        # while the new head is recorded below.
+        bases = {state["head"] for state in git_states}
+        if since:
+            bases.add(since)
+        changed = git_changed_since(project_root, bases, staged)
+    if changed is not None:
+        changed = {prefix + rel for rel in changed}
+        for state in git_states:
+            changed.update(state.get("dirty", []))
+        rels = sorted(rel for rel in changed.union(files) if in_project(rel))
+        paths = [os.path.join(store_root, rel) for rel in rels]
+
+    started = time.time_ns()
+    known = len(files)
+    with profile_phase("walk", cache=label):
+        results, pending, skipped, visited = plan_scan(
+            store_root,
+            paths,
+            files,
+            names,
+            changed,
+            all(analyzer.skip_generated for analyzer in analyzers),
+            max_file_size,
+        )
+    for path, rel, stat, entry, missing, reason in skipped:
+        file_results = entry["results"] if entry else {}
+        for index, result in skipped_results(analyzers, rel, missing).items():
+            file_results[names[index]] = result
+        results[path] = file_results
+        files[rel] = {"size": stat[0], "mtime": stat[1], "sha1": None, "results": file_results, "generated": reason}
+
+    order = list(results) if on_result is not None else []
+    emitted = 0
+
+    def emit_ready() -> None:
+        nonlocal emitted
+        while emitted < len(order) and results[order[emitted]] is not None:
+            on_result(order[emitted], results[order[emitted]])
+            emitted += 1
+
+    emit_ready()
+    tasks = [(path, rel, entry["sha1"] if entry else None, missing) for path, rel, _, entry, missing in pending]
+    sizes = [stat[0] if stat else 0 for _, _, stat, _, _ in pending]
+    with profile_phase("scan", cache=label, files=len(tasks)):
+        outcomes = run_scan_tasks(analyzers, tasks, sizes, resolve_jobs(jobs), readers, read_budget)
+        for (path, rel, stat, entry, _), (digest, scanned, generated) in zip(pending, outcomes):
+            unchanged = entry is not None and digest == entry["sha1"]
+            file_results = entry["results"] if unchanged else {}
+            for index, result in scanned.items():
+                file_results[names[index]] = result
+            results[path] = file_results
+            if digest is not None and stat is not None:
+                # A file modified within the racy window could change again without
+                # its mtime moving; store no mtime so the next run hashes it.
+                mtime = stat[1] if stat[1] + RACY_WINDOW_NS < started else 0
+                files[rel] = {"size": stat[0], "mtime": mtime, "sha1": digest, "results": file_results}
+                if generated:
+                    files[rel]["generated"] = generated
+            emit_ready()
+    profile_count("scan", len(tasks), sum(sizes))
+
+    stale = []
+    pruned = False
+    if session:
+        session.visited[store_root].update(visited)
+    if accept is None:
+        if session:
+            session.unscoped[store_root].update(names)
+        else:
+            pruned = prune_vanished(store_root, files, names, visited)
+    elif changed is None:
+        # A full walk saw every accepted file, so the rest no longer exist here.
+        stale = [
+            rel
+            for rel, entry in files.items()
+            if rel not in visited and in_project(rel) and not entry["results"].keys().isdisjoint(names)
+        ]
+        for rel in stale:
+            for name in names:
+                files[rel]["results"].pop(name, None)
+            if not files[rel]["results"]:
+                del files[rel]
+
+    generated = {(store_root, rel): files[rel]["size"] for rel in visited if files.get(rel, {}).get("generated")}
+    if generated:
+        profile_count("generated", len(generated), sum(generated.values()))
+        GENERATED_SKIPS.update(generated)
+    moved = any((state or {}).get("head") != head for state in git_states)
+    if pending or skipped or stale or pruned or moved or len(files) != known or refresh:
+        dirty = git_dirty_paths(project_root, [rel[len(prefix):] for rel in visited]) if head else None
+        for key in git_keys:
+            if dirty is None:
+                store["git"].pop(key, None)
+            else:
+                store["git"][key] = {"head": head, "dirty": [prefix + rel for rel in dirty]}
+        if session:
+            session.changed.add(store_root)
+        else:
+            with profile_phase("cache save", cache=label):
+                save_result_store(store_root, store)
+    return results
+
+
+def scan_files(
+    project_root: str,
+    paths: Iterable[str],
+    scan_fn: ScanFunction,
+    cache_name: str,
+    schema: str,
+    skip_generated: bool = False,
+    on_result: Optional[Callable[[str, dict], None]] = None,
+    streams: bool = False,
+    **options: Any,
+) -> Dict[str, dict]:
+    analyzer = Analyzer(cache_name, schema, scan_fn, skip_generated, streams)
+    if on_result is not None:
+        options["on_result"] = lambda path, file_results: on_result(path, file_results[cache_name])
+    results = analyze_files(project_root, paths, [analyzer], **options)
+    return {path: file_results[cache_name] for path, file_results in results.items()}
+
+
+class RepositorySnapshot:
+    """One os.scandir walk of a tree, indexed for the lookups the skills repeat.
+
+    Directories are visited in the same pre-order as os.walk (entries in
+    scandir order, symlinked directories listed but not entered), so
+    find_file returns the same first match a fresh os.walk would. Directory
+    names in skip_dirs and paths matched by ``ignore`` are pruned, and a
+    directory whose inode was already walked (a bind mount or a duplicate
+    checkout) is not walked again. The walk runs lazily on first use.
+    """
+
+    def __init__(self, root: str, skip_dirs: Iterable[str] = (), use_ignore_files: bool = True) -> None:
+        self.root = root
+        self.skip_dirs = frozenset(skip_dirs)
+        self.ignore = IgnoreRules(root) if use_ignore_files else None
+        self.built = False
+        self.files: Dict[str, List[str]] = {}
+        self.subdirs: Dict[str, List[str]] = {}
+        self.directories: Set[str] = set()
+        self.files_by_name: Dict[str, List[str]] = {}
+        self.dirs_by_name: Dict[str, List[str]] = {}
+        self.files_by_extension: Dict[str, List[str]] = {}
+
+    def build(self) -> "RepositorySnapshot":
+        if self.built:
+            return self
+        self.built = True
+        with profile_phase("snapshot"):
+            ignore = self.ignore
+            visited: Set[Tuple[int, int]] = set()
+            stack = [(self.root, "")]
+            while stack:
+                top, rel_top = stack.pop()
+                try:
+                    stat = os.stat(top)
+                    if (stat.st_dev, stat.st_ino) in visited:
+                        continue
+                    visited.add((stat.st_dev, stat.st_ino))
+                    with os.scandir(top) as iterator:
+                        entries = list(iterator)
+                except OSError:
+                    continue
+                check_files = ignore is not None and ignore.checks_files(rel_top)
+                names = []
+                dir_names = []
+                subdirs = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir and entry.name in self.skip_dirs:
+                        continue
+                    rel = f"{rel_top}/{entry.name}" if rel_top else entry.name
+                    if (check_files or is_dir and ignore is not None) and ignore.matches(rel_top, rel, is_dir):
+                        continue
+                    if not is_dir:
+                        names.append(entry.name)
+                        self.files_by_name.setdefault(entry.name, []).append(entry.path)
+                        extension = os.path.splitext(entry.name)[1]
+                        self.files_by_extension.setdefault(extension, []).append(entry.path)
+                        continue
+                    dir_names.append(entry.name)
+                    self.directories.add(entry.path)
+                    self.dirs_by_name.setdefault(entry.name, []).append(entry.path)
+                    try:
+                        if not entry.is_symlink():
+                            subdirs.append((entry.path, rel))
+                    except OSError:
+                        pass
+                self.files[top] = names
+                self.subdirs[top] = dir_names
+                stack.extend(reversed(subdirs))
+        profile_count("snapshot", sum(len(names) for names in self.files.values()))
+        return self
+
+    def accepts(self, accept: AcceptFunction) -> AcceptFunction:
+        """``accept`` narrowed to the paths the walk would not ignore."""
+        ignore = self.ignore
+        if ignore is None:
+            return accept
+        return lambda rel: accept(rel) and not ignore.ignored(rel)
+
+    def under(self, path: str, root: Optional[str]) -> bool:
+        return root is None or path.startswith(os.path.join(root, ""))
+
+    def is_dir(self, path: str) -> bool:
+        self.build()
+        return path == self.root or path in self.directories
+
+    def has_file(self, path: str) -> bool:
+        return os.path.basename(path) in self.build().files.get(os.path.dirname(path), ())
+
+    def list_files(self, directory: str) -> List[str]:
+        return list(self.build().files.get(directory, []))
+
+    def list_dirs(self, directory: str) -> List[str]:
+        return list(self.build().subdirs.get(directory, []))
+
+    def find_file(self, root: str, filename: str) -> Optional[str]:
+        for path in self.build().files_by_name.get(filename, []):
+            if self.under(path, root):
+                return path
+        return None
+
+    def find_dirs(self, root: str, dirname: str) -> List[str]:
+        return [path for path in self.build().dirs_by_name.get(dirname, []) if self.under(path, root)]
+
+    def iter_files(
+        self,
+        extensions: Tuple[str, ...],
+        root: Optional[str] = None,
+        sort: bool = False,
+    ) -> Iterator[str]:
+        self.build()
+        if len(extensions) == 1 and not sort:
+            for path in self.files_by_extension.get(extensions[0], []):
+                if self.under(path, root):
+                    yield path
+            return
+        for directory, names in self.files.items():
+            if directory != root and not self.under(directory, root):
+                continue
+            for name in sorted(names) if sort else names:
+                if name.endswith(extensions):
+                    yield os.path.join(directory, name)
+
+
+def stat_snapshot(paths: Iterable[str]) -> Snapshot:
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def changed_paths(previous: Snapshot, current: Snapshot) -> Set[str]:
+    changed = {path for path, state in current.items() if previous.get(path) != state}
+    changed.update(path for path in previous if path not in current)
+    return changed
+
+
+def wait_for_changes(
+    take_snapshot: Callable[[], Snapshot],
+    previous: Snapshot,
+    interval: float,
+    debounce: float,
+) -> Tuple[List[str], Snapshot]:
+    while True:
+        time.sleep(interval)
+        current = take_snapshot()
+        if changed_paths(previous, current):
+            break
+    while True:
+        time.sleep(debounce)
+        settled = take_snapshot()
+        if settled == current:
+            break
+        current = settled
+    return sorted(changed_paths(previous, current)), current
+
+
+def rescan_paths(
+    project_root: str,
+    results: Dict[str, dict],
+    paths: Iterable[str],
+    scan_fn: ScanFunction,
+    skip_generated: bool = False,
+) -> None:
+    analyzers = [Analyzer(scan_fn.__name__, "", scan_fn, skip_generated)]
+    for path in paths:
+        data = read_source(path)
+        if data is None and not os.path.exists(path):
+            results.pop(path, None)
+            continue
+        results[path] = scan_data(analyzers, os.path.relpath(path, project_root), None, (), data)[1][0]
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import re
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from . import kotlin_lexer
+from .kotlin_lexer import LEXER_PATTERNS, strip_kotlin_comments
+from .symbol_index import SymbolIndex, build_symbol_index, format_matches, stored_digest, summaries_digest
+from .scan_engine import (
+    Analyzer,
+    OutputStream,
+    RepositorySnapshot,
+    add_profile_arguments,
+    add_scan_arguments,
+    add_watch_arguments,
+    finish_profiling,
+    format_generated_summary,
+    profile_measure,
+    profile_phase,
+    relative_to,
+    remove_quietly,
+    rescan_paths,
+    scan_files,
+    scan_options_from_args,
+    schema_key,
+    start_profiling,
+    stat_snapshot,
+    wait_for_changes,
+    write_outputs,
+)
+
+SKIP_DIRS = {
+    ".git",
+    ".gradle",
+    ".idea",
+    "build",
+    "dist",
+    "out",
+}
+
+NAV_GRAPH_RE = re.compile(r"\b(\w+NavGraph)\b")
+COMPOSABLE_SCREEN_RE = re.compile(r"@Composable\s+fun\s+(\w+Screen)\s*\(")
+SEALED_UISTATE_CLASS_RE = re.compile(r"\bsealed\s+class\s+(\w+UiState)\b")
+SEALED_UISTATE_INTERFACE_RE = re.compile(r"\bsealed\s+interface\s+(\w+UiState)\b")
+DATA_UISTATE_RE = re.compile(r"\bdata\s+class\s+(\w*UiState)\b")
+BOTTOM_SHEET_RE = re.compile(r"\b(\w+BottomSheet)\b")
+MODAL_BOTTOM_SHEET_RE = re.compile(r"\bModalBottomSheet\b")
+UISTATE_REF_RE = re.compile(r"\b(\w*UiState)\b")
+DECLARATION_RE = re.compile(r"\b(?:fun|class|object|interface)\s+(\w+(?:BottomSheet|NavGraph))\b")
+
+SCREEN_ANCHOR = "@Composable"
+NAV_GRAPH_ANCHOR = "NavGraph"
+UISTATE_ANCHOR = "UiState"
+BOTTOM_SHEET_ANCHOR = "BottomSheet"
+STRUCTURE_ANCHORS = (SCREEN_ANCHOR, NAV_GRAPH_ANCHOR, UISTATE_ANCHOR, BOTTOM_SHEET_ANCHOR)
+
+STRUCTURE_PATTERNS = (
+    NAV_GRAPH_RE,
+    COMPOSABLE_SCREEN_RE,
+    SEALED_UISTATE_CLASS_RE,
+    SEALED_UISTATE_INTERFACE_RE,
+    DATA_UISTATE_RE,
+    BOTTOM_SHEET_RE,
+    MODAL_BOTTOM_SHEET_RE,
+    UISTATE_REF_RE,
+    DECLARATION_RE,
+    *LEXER_PATTERNS,
+)
+
+# Bump when the summary logic changes in a way STRUCTURE_PATTERNS does not capture.
+STRUCTURE_VERSION = 4
+STRUCTURE_SCHEMA = schema_key(STRUCTURE_VERSION, *STRUCTURE_PATTERNS, *STRUCTURE_ANCHORS)
+STRUCTURE_CACHE_NAME = "structure"
+STRUCTURE_OUTPUT = os.path.join("docs", "structure.json")
+SYMBOL_INDEX_OUTPUT = os.path.join("docs", "structure.symbols")
+SHARD_INDEX_OUTPUT = os.path.join("docs", "structure.index.json")
+SHARD_DIR = os.path.join("docs", "structure")
+SHARD_FORMAT_VERSION = 1
+MODULE_BUILD_FILES = ("build.gradle.kts", "build.gradle")
+SHARD_RECORD_FIELDS = (("screens", "screen"), ("navGraphs", "navGraph"), ("uiStates", "uiState"), ("sheets", "sheet"))
+
+
+def repository_snapshot(root: str) -> RepositorySnapshot:
+    return RepositorySnapshot(root, SKIP_DIRS)
+
+
+def iter_kotlin_files(root: str, snapshot: Optional[RepositorySnapshot] = None) -> Iterable[str]:
+    return (snapshot or repository_snapshot(root)).iter_files((".kt",), sort=True)
+
+
+def is_kotlin_source(rel: str) -> bool:
+    parts = rel.split(os.sep)
+    return parts[-1].endswith(".kt") and not SKIP_DIRS.intersection(parts[:-1])
+
+
+def strip_comments(text: str) -> str:
+    return strip_kotlin_comments(text)
+
+
+def find_anchors(text: str, anchors: Iterable[str] = STRUCTURE_ANCHORS) -> Set[str]:
+    return {anchor for anchor in anchors if anchor in text}
+
+
+def find_ui_states(text: str) -> Set[str]:
+    states = set()
+    for match in SEALED_UISTATE_CLASS_RE.finditer(text):
+        states.add(match.group(1))
+    for match in SEALED_UISTATE_INTERFACE_RE.finditer(text):
+        states.add(match.group(1))
+    for match in DATA_UISTATE_RE.finditer(text):
+        states.add(match.group(1))
+    return states
+
+
+def find_bottom_sheets(text: str) -> Set[str]:
+    sheets = set()
+    for match in BOTTOM_SHEET_RE.finditer(text):
+        sheets.add(match.group(1))
+    if MODAL_BOTTOM_SHEET_RE.search(text):
+        sheets.add("ModalBottomSheet")
+    return sheets
+
+
+def summarize_kotlin_text(text: str, anchors: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+    if anchors is None:
+        anchors = find_anchors(text)
+    summary = {}
+    if SCREEN_ANCHOR in anchors:
+        summary["screens"] = sorted(set(match.group(1) for match in COMPOSABLE_SCREEN_RE.finditer(text)))
+    if NAV_GRAPH_ANCHOR in anchors:
+        summary["navGraphs"] = sorted(set(match.group(1) for match in NAV_GRAPH_RE.finditer(text)))
+    if UISTATE_ANCHOR in anchors:
+        summary["uiStates"] = sorted(find_ui_states(text))
+    if BOTTOM_SHEET_ANCHOR in anchors:
+        summary["sheets"] = sorted(find_bottom_sheets(text))
+    if NAV_GRAPH_ANCHOR in anchors or BOTTOM_SHEET_ANCHOR in anchors:
+        summary["declared"] = sorted(set(DECLARATION_RE.findall(text)))
+    if UISTATE_ANCHOR in anchors:
+        summary["uiStateRefs"] = sorted(set(UISTATE_REF_RE.findall(text)))
+    # Most files declare nothing; keep only non-empty fields so the summaries
+    # held for the whole repository (and its cache) stay proportional to hits.
+    return {field: names for field, names in summary.items() if names}
+
+
+def summarize_kotlin_source(text: str, anchors: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+    if anchors is None:
+        anchors = find_anchors(text)
+    anchors = anchors.intersection(STRUCTURE_ANCHORS)
+    if not anchors:
+        return summarize_kotlin_text("", anchors)
+    with profile_measure("strip_comments"):
+        text = strip_comments(text)
+    return summarize_kotlin_text(text, anchors)
+
+
+def scan_structure_file(rel: str, text: str) -> Dict[str, List[str]]:
+    return summarize_kotlin_source(text)
+
+
+STRUCTURE_ANALYZER = Analyzer(STRUCTURE_CACHE_NAME, STRUCTURE_SCHEMA, scan_structure_file, skip_generated=True)
+
+
+def needs_state_refs(summary: Dict[str, List[str]]) -> bool:
+    return bool(summary.get("screens")) and bool(summary.get("sheets"))
+
+
+class NavigationEdges(Sequence):
+    """Sorted, deduplicated sheet navigation edges over interned symbols.
+
+    Each edge is packed as ``from_id * len(symbols) + to_id`` in an array of
+    machine integers. Symbols are interned in sorted order, so the packed
+    values sort exactly like (from, to) strings. Edge dicts are only built
+    when items are read or the structure is serialized.
+    """
+
+    __slots__ = ("symbols", "edges")
+    event = "state_driven_sheet"
+
+    def __init__(self, symbols: List[str], edges: array) -> None:
+        self.symbols = symbols
+        self.edges = edges
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict, List[dict]]:
+        if isinstance(index, slice):
+            return [self.edge(packed) for packed in self.edges[index]]
+        return self.edge(self.edges[index])
+
+    def __iter__(self) -> Iterator[dict]:
+        return map(self.edge, self.edges)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NavigationEdges):
+            return list(self) == list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def edge(self, packed: int) -> dict:
+        source, target = divmod(packed, len(self.symbols))
+        return {"from": self.symbols[source], "to": self.symbols[target], "event": self.event}
+
+
+def build_navigation(candidates: List[Dict[str, List[str]]]) -> NavigationEdges:
+    symbols = sorted({name for summary in candidates for name in summary["screens"] + summary["sheets"]})
+    ids = {name: position for position, name in enumerate(symbols)}
+    targets: Dict[int, Set[int]] = {}
+    for summary in candidates:
+        sheet_ids = [ids[sheet] for sheet in summary["sheets"]]
+        for screen in summary["screens"]:
+            targets.setdefault(ids[screen], set()).update(sheet_ids)
+    edges = array("q")
+    for source in sorted(targets):
+        base = source * len(symbols)
+        edges.extend(base + target for target in sorted(targets[source]))
+    return NavigationEdges(symbols, edges)
+
+
+def structure_json_default(value: object) -> List[dict]:
+    if isinstance(value, NavigationEdges):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def build_structure(summaries: Iterable[Dict[str, List[str]]]) -> Dict[str, List[dict]]:
+    screens = set()
+    nav_graphs = set()
+    ui_states = set()
+    candidates = []
+    # Identifier -> positions in candidates, so the join is one set intersection
+    # against the declared UiStates instead of a lookup per file and state.
+    refs_index: Dict[str, Set[int]] = {}
+    for summary in summaries:
+        screens.update(summary.get("screens", ()))
+        nav_graphs.update(summary.get("navGraphs", ()))
+        ui_states.update(summary.get("uiStates", ()))
+        if needs_state_refs(summary):
+            for name in summary.get("uiStateRefs", ()):
+                refs_index.setdefault(name, set()).add(len(candidates))
+            candidates.append(summary)
+
+    linked: Set[int] = set()
+    for state in ui_states.intersection(refs_index):
+        linked.update(refs_index[state])
+
+    return {
+        "screens": sorted(screens.union(nav_graphs)),
+        "navigation": build_navigation([candidates[position] for position in sorted(linked)]),
+        "uiStates": sorted(ui_states),
+    }
+
+
+def collect_summaries(
+    root: str,
+    scan_options: Optional[Dict[str, Any]] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+    on_result: Optional[Callable[[str, dict], None]] = None,
+) -> Dict[str, dict]:
+    snapshot = snapshot or repository_snapshot(root)
+    return scan_files(
+        root,
+        iter_kotlin_files(root, snapshot),
+        scan_structure_file,
+        STRUCTURE_CACHE_NAME,
+        STRUCTURE_SCHEMA,
+        accept=snapshot.accepts(is_kotlin_source),
+        skip_generated=True,
+        on_result=on_result,
+        **(scan_options or {}),
+    )
+
+
+def collect_structure(root: str, scan_options: Optional[Dict[str, Any]] = None) -> Dict[str, List[dict]]:
+    summaries = collect_summaries(root, scan_options)
+    with profile_phase("join"):
+        return build_structure(summaries.values())
+
+
+def render_structure(structure: Dict[str, List[dict]]) -> str:
+    with profile_phase("render"):
+        return json.dumps(structure, indent=2, default=structure_json_default) + "\n"
+
+
+def module_resolver(project_root: str) -> Callable[[str], str]:
+    """Map a project-relative directory to the Gradle path of its module.
+
+    The module is the nearest ancestor holding a build script; files outside
+    any subproject belong to the root project ``:``.
+    """
+    modules: Dict[str, str] = {}
+
+    def resolve(directory: str) -> str:
+        if directory not in modules:
+            if not directory:
+                modules[directory] = ":"
+            elif any(os.path.isfile(os.path.join(project_root, directory, name)) for name in MODULE_BUILD_FILES):
+                modules[directory] = ":" + directory.replace(os.sep, ":")
+            else:
+                modules[directory] = resolve(os.path.dirname(directory))
+        return modules[directory]
+
+    return resolve
+
+
+def shard_filename(module: str) -> str:
+    return (module.strip(":").replace(":", ".") or "root") + ".jsonl"
+
+
+class ShardWriter:
+    """Stream docs/structure.index.json plus one JSON Lines shard per module.
+
+    Each shard holds the screen, NavGraph, UiState and sheet records of the
+    module's files followed by the navigation edges those files produce, so
+    consumers can load a single module. ``add`` appends a file's records to
+    its module's shard as soon as its summary is known, typically while the
+    scan is still running; only the files that can produce navigation edges
+    are kept until ``finish`` appends those edges, closes the shards (each is
+    only replaced when its content changes), removes the shards of vanished
+    modules and writes the manifest.
+    """
+
+    def __init__(self, project_root: str) -> None:
+        self.project_root = project_root
+        self.shard_dir = os.path.join(project_root, SHARD_DIR)
+        self.resolve = module_resolver(project_root)
+        self.ui_states: Set[str] = set()
+        self.streams: Dict[str, OutputStream] = {}
+        self.files: Dict[str, int] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.candidates: Dict[str, List[Dict[str, List[str]]]] = {}
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is not None:
+            for stream in self.streams.values():
+                stream.__exit__(exc_type, *exc)
+
+    def add(self, path: str, summary: Dict[str, List[str]]) -> None:
+        rel = relative_to(path, self.project_root)
+        module = self.resolve(os.path.dirname(rel))
+        stream = self.streams.get(module)
+        if stream is None:
+            stream = self.streams[module] = OutputStream(os.path.join(self.shard_dir, shard_filename(module)))
+            self.files[module] = 0
+            self.counts[module] = {kind: 0 for _, kind in SHARD_RECORD_FIELDS}
+            self.candidates[module] = []
+        self.files[module] += 1
+        counts = self.counts[module]
+        for field, kind in SHARD_RECORD_FIELDS:
+            for name in summary.get(field, ()):
+                stream.write(json.dumps({"kind": kind, "name": name, "file": rel}) + "\n")
+                counts[kind] += 1
+        self.ui_states.update(summary.get("uiStates", ()))
+        if needs_state_refs(summary):
+            self.candidates[module].append(summary)
+
+    def finish(self) -> Tuple[List[str], List[str]]:
+        written: List[str] = []
+        unchanged: List[str] = []
+        entries = []
+        index_dir = os.path.dirname(os.path.join(self.project_root, SHARD_INDEX_OUTPUT))
+        with profile_phase("shards", modules=len(self.streams)):
+            for module in sorted(self.streams):
+                stream = self.streams[module]
+                with stream:
+                    candidates = [
+                        summary
+                        for summary in self.candidates[module]
+                        if self.ui_states.intersection(summary.get("uiStateRefs", ()))
+                    ]
+                    navigation = build_navigation(candidates)
+                    for edge in navigation:
+                        stream.write(json.dumps({"kind": "navigation", **edge}) + "\n")
+                (written if stream.changed else unchanged).append(stream.path)
+                entries.append(
+                    {
+                        "module": module,
+                        "shard": os.path.relpath(stream.path, index_dir),
+                        "files": self.files[module],
+                        **self.counts[module],
+                        "navigation": len(navigation),
+                    }
+                )
+        current = {os.path.basename(path) for path in written + unchanged}
+        for name in sorted(os.listdir(self.shard_dir)) if os.path.isdir(self.shard_dir) else []:
+            if name.endswith(".jsonl") and name not in current:
+                os.remove(os.path.join(self.shard_dir, name))
+
+        manifest = {"version": SHARD_FORMAT_VERSION, "uiStates": len(self.ui_states), "modules": entries}
+        manifest_written, manifest_unchanged = write_outputs(
+            {os.path.join(self.project_root, SHARD_INDEX_OUTPUT): json.dumps(manifest, indent=2) + "\n"}
+        )
+        return written + manifest_written, unchanged + manifest_unchanged
+
+
+def write_sharded_structure(project_root: str, summaries: Dict[str, dict]) -> Tuple[List[str], List[str]]:
+    """Write the sharded structure of summaries that are already collected."""
+    with ShardWriter(project_root) as writer:
+        for path, summary in summaries.items():
+            writer.add(path, summary)
+        return writer.finish()
+
+
+def render_outputs(project_root: str, summaries: Dict[str, dict], sharded: bool = False) -> Dict[str, Union[str, bytes]]:
+    """Render the outputs that need writing; an up-to-date symbol index is left out.
+
+    The index header records a digest of the summaries it was built from,
+    so runs where no summary changed skip building it altogether.
+    """
+    outputs: Dict[str, Union[str, bytes]] = {}
+    if not sharded:
+        with profile_phase("join"):
+            structure = build_structure(summaries.values())
+        outputs[os.path.join(project_root, STRUCTURE_OUTPUT)] = render_structure(structure)
+    with profile_phase("symbol index"):
+        index_path = os.path.join(project_root, SYMBOL_INDEX_OUTPUT)
+        digest = summaries_digest(project_root, summaries)
+        if stored_digest(index_path) != digest:
+            outputs[index_path] = build_symbol_index(project_root, summaries, digest)
+    return outputs
+
+
+def write_structure(
+    project_root: str,
+    summaries: Dict[str, dict],
+    sharded: bool = False,
+    shards: Optional[ShardWriter] = None,
+) -> Tuple[List[str], List[str]]:
+    """Write the structure outputs of ``summaries``.
+
+    In sharded mode ``shards``, a ShardWriter already fed during the scan,
+    is finished instead of writing every shard from ``summaries``, and a
+    docs/structure.json left by an unsharded run is removed so it cannot go
+    stale.
+    """
+    written, unchanged = [], []
+    if sharded:
+        written, unchanged = shards.finish() if shards is not None else write_sharded_structure(project_root, summaries)
+        remove_quietly(os.path.join(project_root, STRUCTURE_OUTPUT))
+    outputs = render_outputs(project_root, summaries, sharded)
+    more_written, more_unchanged = write_outputs(outputs)
+    index_path = os.path.join(project_root, SYMBOL_INDEX_OUTPUT)
+    if index_path not in outputs:
+        more_unchanged.append(index_path)
+    return written + more_written, unchanged + more_unchanged
+
+
+def watch_structure(
+    project_root: str,
+    scan_options: Dict[str, Any],
+    interval: float,
+    debounce: float,
+    sharded: bool = False,
+    summaries: Optional[Dict[str, dict]] = None,
+    files: Optional[RepositorySnapshot] = None,
+) -> int:
+    """Keep the structure outputs up to date until interrupted.
+
+    Callers that just wrote the structure pass its ``summaries`` and the
+    RepositorySnapshot ``files`` they were collected from, so the watch
+    starts from them instead of walking, scanning and writing again.
+    """
+    if summaries is None:
+        files = repository_snapshot(project_root)
+        summaries = collect_summaries(project_root, scan_options, files)
+        write_structure(project_root, summaries, sharded)
+    snapshot = stat_snapshot(iter_kotlin_files(project_root, files))
+    output_name = "structure shards" if sharded else "structure.json"
+    print(f"Watching {project_root} (Ctrl+C to stop).")
+    try:
+        while True:
+            changed, snapshot = wait_for_changes(
+                lambda: stat_snapshot(iter_kotlin_files(project_root)),
+                snapshot,
+                interval,
+                debounce,
+            )
+            rescan_paths(project_root, summaries, changed, scan_structure_file, skip_generated=True)
+            summaries = {path: summaries[path] for path in snapshot if path in summaries}
+            written, _ = write_structure(project_root, summaries, sharded)
+            print(f"{len(changed)} file(s) changed -> {output_name} {'updated' if written else 'unchanged'}")
+    except KeyboardInterrupt:
+        print("Watch stopped.")
+        return 0
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract screens, UiStates and sheet navigation into docs/structure.json.",
+        epilog="Use `extract_structure.py query SYMBOL` to search the generated docs/structure.symbols index.",
+    )
+    parser.add_argument("project", nargs="?", help="Project root to scan.")
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Write docs/structure.index.json and per-module JSON Lines shards in docs/structure/ "
+        "instead of a single docs/structure.json.",
+    )
+    add_scan_arguments(parser)
+    add_watch_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def parse_query_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="extract_structure.py query",
+        description="Look up which files declare or reference a screen, UiState, sheet or NavGraph.",
+    )
+    parser.add_argument("symbol", help="Symbol name, e.g. LoginUiState.")
+    parser.add_argument("--project", default=".", help="Project root holding docs/structure.symbols (default: cwd).")
+    parser.add_argument("--prefix", action="store_true", help="Match every symbol starting with the name.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum symbols to print with --prefix (default 50).")
+    parser.add_argument("--json", action="store_true", help="Print matches as JSON.")
+    return parser.parse_args(argv)
+
+
+def query_main(argv: List[str]) -> int:
+    args = parse_query_args(argv)
+    index_path = os.path.join(os.path.abspath(args.project), SYMBOL_INDEX_OUTPUT)
+    if not os.path.isfile(index_path):
+        print(f"Error: {index_path} not found; run extract_structure.py on the project first.")
+        return 1
+    try:
+        with SymbolIndex(index_path) as index:
+            matches = index.lookup(args.symbol, prefix=args.prefix, limit=args.limit if args.prefix else None)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+    if not matches:
+        print(f"No symbol matches {args.symbol!r}.")
+        return 1
+    print(json.dumps(matches, indent=2) if args.json else format_matches(matches))
+    return 0
+
+
+def resolve_project_root(project: Optional[str]) -> str:
+    if not project:
+        raise ValueError("Missing project path argument.")
+    root = os.path.abspath(project)
+    if not os.path.isdir(root):
+        raise ValueError(f"Project path is not a directory: {root}")
+    return root
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["query"]:
+        return query_main(argv[1:])
+    args = parse_args(argv)
+    try:
+        project_root = resolve_project_root(args.project)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+
+    start_profiling(args, [sys.modules[__name__], kotlin_lexer])
+    if args.watch:
+        status = watch_structure(project_root, scan_options_from_args(args), args.interval, args.debounce, args.sharded)
+        finish_profiling(args)
+        return status
+    if args.sharded:
+        # Shards are written as summaries arrive from the scan.
+        with ShardWriter(project_root) as shards:
+            summaries = collect_summaries(project_root, scan_options_from_args(args), on_result=shards.add)
+            write_structure(project_root, summaries, True, shards)
+    else:
+        write_structure(project_root, collect_summaries(project_root, scan_options_from_args(args)))
+    print(format_generated_summary())
+    finish_profiling(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
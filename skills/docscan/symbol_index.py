@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .scan_engine import relative_to
+
+# Layout, all integers little-endian uint32:
+#   header    magic, SHA-1 of the summaries it was built from,
+#             file count, symbol count, posting count
+#   files     (string offset, length) per file, sorted by path
+#   symbols   (string offset, length, kind, first posting, posting count),
+#             sorted by UTF-8 name then kind so lookups can bisect the mmap
+#   postings  file id << 1 | role, declarations first
+#   strings   UTF-8 paths and names, offsets relative to this section
+MAGIC = b"KSYMIDX\x02"
+HEADER = struct.Struct("<8s20sIII")
+FILE_ENTRY = struct.Struct("<II")
+SYMBOL_ENTRY = struct.Struct("<IIIII")
+POSTING = struct.Struct("<I")
+
+KINDS = ("screen", "uiState", "sheet", "navGraph")
+ROLES = ("declares", "references")
+DECLARES = 0
+REFERENCES = 1
+
+Posting = Tuple[int, str, int]
+
+
+def summary_postings(summary: Dict[str, List[str]], ui_states: Set[str]) -> Iterator[Posting]:
+    declared = set(summary.get("declared", ()))
+    for name in summary.get("screens", ()):
+        yield KINDS.index("screen"), name, DECLARES
+    own_states = set(summary.get("uiStates", ()))
+    for name in own_states:
+        yield KINDS.index("uiState"), name, DECLARES
+    for name in ui_states.intersection(summary.get("uiStateRefs", ())) - own_states:
+        yield KINDS.index("uiState"), name, REFERENCES
+    for field, kind in (("sheets", "sheet"), ("navGraphs", "navGraph")):
+        for name in summary.get(field, ()):
+            yield KINDS.index(kind), name, DECLARES if name in declared else REFERENCES
+
+
+def summaries_digest(project_root: str, summaries: Dict[str, Dict[str, List[str]]]) -> bytes:
+    payload = json.dumps([project_root, summaries], separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).digest()
+
+
+def stored_digest(path: str) -> Optional[bytes]:
+    """The summaries digest of the index at ``path``, or None if it is unusable."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, digest, file_count, symbol_count, posting_count = HEADER.unpack(header)
+    tables = file_count * FILE_ENTRY.size + symbol_count * SYMBOL_ENTRY.size + posting_count * POSTING.size
+    if magic != MAGIC or HEADER.size + tables > size:
+        return None
+    return digest
+
+
+def build_symbol_index(
+    project_root: str,
+    summaries: Dict[str, Dict[str, List[str]]],
+    digest: Optional[bytes] = None,
+) -> bytes:
+    """Pack the symbol -> declaring/referencing files map of ``summaries``.
+
+    Screens and UiStates are declarations; UiState references only count
+    names declared somewhere in the project. Sheets and NavGraphs are
+    declarations where the file defines them and references elsewhere.
+    ``digest`` is summaries_digest() of the input when already computed.
+    """
+    ui_states = set()
+    for summary in summaries.values():
+        ui_states.update(summary.get("uiStates", ()))
+    by_file = {}
+    for path, summary in summaries.items():
+        postings = list(summary_postings(summary, ui_states))
+        if postings:
+            by_file[relative_to(path, project_root)] = postings
+
+    paths = sorted(by_file)
+    symbols: Dict[Tuple[bytes, int], Set[int]] = {}
+    for file_id, path in enumerate(paths):
+        for kind, name, role in by_file[path]:
+            symbols.setdefault((name.encode("utf-8"), kind), set()).add(file_id << 1 | role)
+
+    strings = bytearray()
+    files = bytearray()
+    for path in paths:
+        encoded = path.encode("utf-8")
+        files += FILE_ENTRY.pack(len(strings), len(encoded))
+        strings += encoded
+    entries = bytearray()
+    postings = bytearray()
+    count = 0
+    for (name, kind), values in sorted(symbols.items()):
+        ordered = sorted(values, key=lambda value: (value & 1, value >> 1))
+        entries += SYMBOL_ENTRY.pack(len(strings), len(name), kind, count, len(ordered))
+        strings += name
+        postings += struct.pack(f"<{len(ordered)}I", *ordered)
+        count += len(ordered)
+    if digest is None:
+        digest = summaries_digest(project_root, summaries)
+    header = HEADER.pack(MAGIC, digest, len(paths), len(symbols), count)
+    return bytes(header + files + entries + postings + strings)
+
+
+class SymbolIndex:
+    """Read-only view of a symbol index file through ``mmap``.
+
+    Only the header is decoded up front; lookups bisect the symbol table
+    and touch just the entries, postings and strings they need.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            # mmap refuses empty files, so short ones are rejected before mapping.
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"Truncated symbol index: {path}; run extract_structure.py again.")
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self.file_count, self.symbol_count, posting_count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            self.data.close()
+            raise ValueError(f"Not a symbol index: {path}; run extract_structure.py again.")
+        self.files_offset = HEADER.size
+        self.symbols_offset = self.files_offset + self.file_count * FILE_ENTRY.size
+        self.postings_offset = self.symbols_offset + self.symbol_count * SYMBOL_ENTRY.size
+        self.strings_offset = self.postings_offset + posting_count * POSTING.size
+        if self.strings_offset > len(self.data):
+            self.data.close()
+            raise ValueError(f"Truncated symbol index: {path}; run extract_structure.py again.")
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.data.close()
+
+    def string(self, offset: int, length: int) -> bytes:
+        start = self.strings_offset + offset
+        return self.data[start:start + length]
+
+    def file(self, file_id: int) -> str:
+        offset, length = FILE_ENTRY.unpack_from(self.data, self.files_offset + file_id * FILE_ENTRY.size)
+        return self.string(offset, length).decode("utf-8")
+
+    def symbol(self, index: int) -> Tuple[bytes, int, int, int]:
+        offset, length, kind, first, count = SYMBOL_ENTRY.unpack_from(
+            self.data, self.symbols_offset + index * SYMBOL_ENTRY.size
+        )
+        return self.string(offset, length), kind, first, count
+
+    def bisect(self, name: bytes) -> int:
+        low, high = 0, self.symbol_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.symbol(middle)[0] < name:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entry(self, index: int) -> dict:
+        name, kind, first, count = self.symbol(index)
+        result = {"symbol": name.decode("utf-8"), "kind": KINDS[kind]}
+        for role in ROLES:
+            result[role] = []
+        start = self.postings_offset + first * POSTING.size
+        for (value,) in POSTING.iter_unpack(self.data[start:start + count * POSTING.size]):
+            result[ROLES[value & 1]].append(self.file(value >> 1))
+        return result
+
+    def lookup(self, name: str, prefix: bool = False, limit: Optional[int] = None) -> List[dict]:
+        key = name.encode("utf-8")
+        matches = []
+        index = self.bisect(key)
+        while index < self.symbol_count and (limit is None or len(matches) < limit):
+            found = self.symbol(index)[0]
+            if not (found.startswith(key) if prefix else found == key):
+                break
+            matches.append(self.entry(index))
+            index += 1
+        return matches
+
+
+def format_matches(matches: Iterable[dict]) -> str:
+    lines = []
+    for match in matches:
+        lines.append(f"{match['symbol']} ({match['kind']})")
+        for role, label in (("declares", "declared in"), ("references", "referenced in")):
+            for path in match[role]:
+                lines.append(f"  {label}: {path}")
+    return "\n".join(lines)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+from pathlib import Path
+from typing import Dict, Union
+
+from .scan_engine import profile_measure
+
+
+def read_text(path: Union[str, Path]) -> str:
+    try:
+        return Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def fill_template(template: str, data: Dict[str, str]) -> str:
+    with profile_measure("fill_template"):
+        for key, value in data.items():
+            template = template.replace("{{" + key + "}}", value)
+    return template
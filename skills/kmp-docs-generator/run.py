@@ -1,8 +1,47 @@
 #!/usr/bin/env python3
+import argparse
+import json
+import os
 import re
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, List
-from extract_structure import collect_structure, iter_kotlin_files
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from docscan import gradle, kotlin_lexer, structure as extract_structure
+from docscan.gradle import classify_dependencies, extract_gradle_dependencies
+from docscan.structure import (
+    STRUCTURE_ANALYZER,
+    STRUCTURE_ANCHORS,
+    NavigationEdges,
+    build_structure,
+    find_anchors,
+    is_kotlin_source,
+    iter_kotlin_files,
+    repository_snapshot,
+    structure_json_default,
+    summarize_kotlin_source,
+)
+from docscan.scan_engine import (
+    Analyzer,
+    RepositorySnapshot,
+    add_profile_arguments,
+    add_scan_arguments,
+    add_watch_arguments,
+    analyze_files,
+    finish_profiling,
+    format_generated_summary,
+    format_write_summary,
+    profile_phase,
+    relative_to,
+    rescan_paths,
+    scan_options_from_args,
+    schema_key,
+    start_profiling,
+    stat_snapshot,
+    wait_for_changes,
+    write_outputs,
+)
+from docscan.templates import fill_template, read_text
 ANDROID_ACTIVITY_RE = re.compile(r"\bclass\s+(\w*MainActivity)\b")
 IOS_VIEW_CONTROLLER_RE = re.compile(r"\bclass\s+(\w*MainViewController)\b")
 COMPOSE_CONTROLLER_RE = re.compile(r"\bComposeUIViewController\s*\{")
@@ -17,12 +56,63 @@ COMPOSABLE_ROUTE_NAMED_RE = re.compile(r'\bcomposable\s*\(\s*route\s*=\s*["\']([
 CODE_BLOCK_RE = re.compile(r"^```")
 HEADING_RE = re.compile(r"^(#+)\s+(.*)$")
 PLACEHOLDER_RE = re.compile(r"{{\w+}}")
+FILE_PATTERNS = {
+    "NavGraph": NAV_GRAPH_RE,
+    "UiState": UISTATE_RE,
+    "BottomSheet": BOTTOM_SHEET_RE,
+}
 MAX_LIST_ITEMS = 12
-def read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except OSError:
-        return ""
+ANDROID_ACTIVITY_ANCHOR = "MainActivity"
+IOS_VIEW_CONTROLLER_ANCHOR = "MainViewController"
+COMPOSE_CONTROLLER_ANCHOR = "ComposeUIViewController"
+APP_FUNCTION_ANCHOR = "App"
+VIEWMODEL_ANCHOR = "ViewModel"
+COMPOSABLE_ROUTE_ANCHOR = "composable"
+FILE_PATTERN_ANCHORS = {
+    "NavGraph": "NavGraph",
+    "UiState": "UiState",
+    "BottomSheet": "BottomSheet",
+}
+SCAN_ANCHORS = tuple(
+    sorted(
+        {
+            ANDROID_ACTIVITY_ANCHOR,
+            IOS_VIEW_CONTROLLER_ANCHOR,
+            COMPOSE_CONTROLLER_ANCHOR,
+            APP_FUNCTION_ANCHOR,
+            VIEWMODEL_ANCHOR,
+            COMPOSABLE_ROUTE_ANCHOR,
+            *FILE_PATTERN_ANCHORS.values(),
+            *STRUCTURE_ANCHORS,
+        }
+    )
+)
+SCAN_CACHE_NAME = "kmp-docs-generator"
+DEPENDENCY_CATEGORIES = (
+    ("di", ("koin", "dagger", "hilt")),
+    ("network", ("ktor", "retrofit", "okhttp")),
+    ("db", ("room", "sqldelight", "datastore")),
+    ("serialization", ("serialization", "moshi", "gson")),
+    ("async", ("coroutines", "rxjava")),
+    ("navigation", ("navigation",)),
+    ("logging", ("timber", "logger")),
+    ("analytics", ("firebase", "analytics", "crashlytics")),
+    ("testing", ("junit", "kotest", "mock", "espresso")),
+)
+# Bump when scan_kotlin_file changes in a way the pattern list below does not capture.
+SCAN_VERSION = 1
+SCAN_SCHEMA = schema_key(
+    SCAN_VERSION,
+    ANDROID_ACTIVITY_RE,
+    IOS_VIEW_CONTROLLER_RE,
+    COMPOSE_CONTROLLER_RE,
+    APP_FUNCTION_RE,
+    VIEWMODEL_RE,
+    COMPOSABLE_ROUTE_RE,
+    COMPOSABLE_ROUTE_NAMED_RE,
+    *FILE_PATTERNS.values(),
+    *SCAN_ANCHORS,
+)
 def rel_path(path: Path, root: Path) -> str:
     try:
         return str(path.relative_to(root))
@@ -30,50 +120,120 @@ def rel_path(path: Path, root: Path) -> str:
         return str(path)
 def template_has_placeholders(text: str) -> bool:
     return bool(PLACEHOLDER_RE.search(text))
-def fill_template(template: str, data: Dict[str, str]) -> str:
-    for key, value in data.items():
-        template = template.replace("{{" + key + "}}", value)
-    return template
 def load_template_with_fallback(path: Path, fallback: str) -> str:
     template = read_text(path)
     if template.strip() and template_has_placeholders(template):
         return template
     return fallback
-def find_entry_points(kotlin_files: Iterable[Path], project_root: Path) -> Dict[str, List[str]]:
+def scan_kotlin_file(rel: str, text: str, anchors: Set[str]) -> Dict[str, object]:
+    parts = Path(rel).parts
+    in_android = "androidMain" in parts
+    in_ios = "iosMain" in parts
+    record = {
+        "path": rel,
+        "android": [],
+        "ios": [],
+        "composeController": False,
+        "app": False,
+        "viewModels": [],
+        "routes": [],
+        "sheets": [],
+        "modalSheet": False,
+        "patterns": [],
+    }
+    if in_android and ANDROID_ACTIVITY_ANCHOR in anchors:
+        record["android"] = ANDROID_ACTIVITY_RE.findall(text)
+    if in_ios and IOS_VIEW_CONTROLLER_ANCHOR in anchors:
+        record["ios"] = IOS_VIEW_CONTROLLER_RE.findall(text)
+    if in_ios and COMPOSE_CONTROLLER_ANCHOR in anchors:
+        record["composeController"] = bool(COMPOSE_CONTROLLER_RE.search(text))
+    if APP_FUNCTION_ANCHOR in anchors:
+        record["app"] = bool(APP_FUNCTION_RE.search(text))
+    if VIEWMODEL_ANCHOR in anchors:
+        record["viewModels"] = VIEWMODEL_RE.findall(text)
+    if COMPOSABLE_ROUTE_ANCHOR in anchors:
+        record["routes"] = COMPOSABLE_ROUTE_RE.findall(text) + COMPOSABLE_ROUTE_NAMED_RE.findall(text)
+    if FILE_PATTERN_ANCHORS["BottomSheet"] in anchors:
+        record["sheets"] = BOTTOM_SHEET_RE.findall(text)
+        record["modalSheet"] = bool(MODAL_BOTTOM_SHEET_RE.search(text))
+    record["patterns"] = [
+        label
+        for label, pattern in FILE_PATTERNS.items()
+        if FILE_PATTERN_ANCHORS[label] in anchors and pattern.search(text)
+    ]
+    return record
+def scan_kotlin_record(rel: str, text: str) -> Dict[str, object]:
+    return scan_kotlin_file(rel, text, find_anchors(text, SCAN_ANCHORS))
+SCAN_ANALYZER = Analyzer(SCAN_CACHE_NAME, SCAN_SCHEMA, scan_kotlin_record, skip_generated=True)
+def scan_kotlin_source(rel: str, text: str) -> Dict[str, object]:
+    anchors = find_anchors(text, SCAN_ANCHORS)
+    record = scan_kotlin_file(rel, text, anchors)
+    record["structure"] = summarize_kotlin_source(text, anchors)
+    return record
+def scan_project_files(
+    project_root: Path,
+    scan_options: Optional[Dict[str, Any]] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+) -> Dict[str, Dict[str, object]]:
+    # The structure summaries go to the shared store under their own analyzer,
+    # so extract_structure.py and update-doc-skill reuse them on the same tree.
+    snapshot = snapshot or repository_snapshot(str(project_root))
+    results = analyze_files(
+        str(project_root),
+        iter_kotlin_files(str(project_root), snapshot),
+        [STRUCTURE_ANALYZER, SCAN_ANALYZER],
+        accept=snapshot.accepts(is_kotlin_source),
+        **(scan_options or {}),
+    )
+    # Stored records may come from an enclosing project sharing the store.
+    return {
+        path: dict(
+            found[SCAN_CACHE_NAME],
+            path=relative_to(path, str(project_root)),
+            structure=found[STRUCTURE_ANALYZER.name],
+        )
+        for path, found in results.items()
+    }
+def scan_project(
+    project_root: Path,
+    scan_options: Optional[Dict[str, Any]] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+) -> Tuple[List[Dict[str, object]], Dict[str, List[dict]]]:
+    scan = list(scan_project_files(project_root, scan_options, snapshot).values())
+    with profile_phase("join"):
+        structure = build_structure(record["structure"] for record in scan)
+    return scan, structure
+def find_entry_points(scan: Iterable[Dict[str, object]]) -> Dict[str, List[str]]:
     entries = {"android": [], "ios": [], "app": []}
-    for file_path in kotlin_files:
-        text = read_text(file_path)
-        if "androidMain" in file_path.parts:
-            for match in ANDROID_ACTIVITY_RE.findall(text):
-                entries["android"].append(f"{match} ({rel_path(file_path, project_root)})")
-        if "iosMain" in file_path.parts:
-            for match in IOS_VIEW_CONTROLLER_RE.findall(text):
-                entries["ios"].append(f"{match} ({rel_path(file_path, project_root)})")
-            if COMPOSE_CONTROLLER_RE.search(text):
-                entries["ios"].append(f"ComposeUIViewController ({rel_path(file_path, project_root)})")
-        if APP_FUNCTION_RE.search(text):
-            entries["app"].append(f"App() ({rel_path(file_path, project_root)})")
+    for record in scan:
+        path = record["path"]
+        for match in record["android"]:
+            entries["android"].append(f"{match} ({path})")
+        for match in record["ios"]:
+            entries["ios"].append(f"{match} ({path})")
+        if record["composeController"]:
+            entries["ios"].append(f"ComposeUIViewController ({path})")
+        if record["app"]:
+            entries["app"].append(f"App() ({path})")
     for key in entries:
         entries[key] = sorted(set(entries[key]))
     return entries
-def collect_named_symbols(kotlin_files: Iterable[Path], pattern: re.Pattern) -> List[str]:
+def collect_named_symbols(scan: Iterable[Dict[str, object]], key: str) -> List[str]:
     symbols = set()
-    for file_path in kotlin_files:
-        text = read_text(file_path)
-        for match in pattern.findall(text):
-            symbols.add(match)
+    for record in scan:
+        symbols.update(record[key])
     return sorted(symbols)
-def collect_files_with_patterns(
-    kotlin_files: Iterable[Path],
-    project_root: Path,
-    patterns: Dict[str, re.Pattern],
-) -> Dict[str, List[str]]:
-    results = {label: [] for label in patterns}
-    for file_path in kotlin_files:
-        text = read_text(file_path)
-        for label, pattern in patterns.items():
-            if pattern.search(text):
-                results[label].append(rel_path(file_path, project_root))
+def collect_bottom_sheets(scan: List[Dict[str, object]]) -> List[str]:
+    sheets = collect_named_symbols(scan, "sheets")
+    if any(record["modalSheet"] for record in scan):
+        sheets.append("ModalBottomSheet")
+        sheets = sorted(set(sheets))
+    return sheets
+def collect_files_with_patterns(scan: Iterable[Dict[str, object]]) -> Dict[str, List[str]]:
+    results = {label: [] for label in FILE_PATTERNS}
+    for record in scan:
+        for label in record["patterns"]:
+            results[label].append(record["path"])
     for label in results:
         results[label] = sorted(set(results[label]))[:MAX_LIST_ITEMS]
     return results
@@ -115,13 +275,13 @@ def summarize_flows(text: str, max_items: int = 6) -> List[str]:
     if len(summaries) < max_items:
         flush()
     return summaries[:max_items]
-def detect_modules(project_root: Path) -> List[str]:
+def detect_modules(project_root: Path, snapshot: RepositorySnapshot) -> List[str]:
     candidates = ["composeApp", "shared", "androidApp", "iosApp"]
-    modules = [name for name in candidates if (project_root / name).is_dir()]
+    modules = [name for name in candidates if snapshot.is_dir(str(project_root / name))]
     settings_gradle = project_root / "settings.gradle.kts"
-    if not settings_gradle.exists():
+    if not snapshot.has_file(str(settings_gradle)):
         settings_gradle = project_root / "settings.gradle"
-    if settings_gradle.exists():
+    if snapshot.has_file(str(settings_gradle)):
         text = read_text(settings_gradle)
         for match in re.findall(r"include\(([^)]+)\)", text):
             for raw in match.split(","):
@@ -129,101 +289,37 @@ def detect_modules(project_root: Path) -> List[str]:
                 if name:
                     modules.append(name)
     return sorted(set(modules))
-def find_common_main(project_root: Path, modules: List[str]) -> List[str]:
+def find_common_main(project_root: Path, modules: List[str], snapshot: RepositorySnapshot) -> List[str]:
     common_paths = []
     for module in modules:
         path = project_root / module / "src" / "commonMain"
-        if path.is_dir():
+        if snapshot.is_dir(str(path)):
             common_paths.append(str(path.relative_to(project_root)))
     return common_paths
-def find_layer_paths(project_root: Path, common_main_paths: List[str]) -> Dict[str, List[str]]:
+def find_layer_paths(
+    project_root: Path,
+    common_main_paths: List[str],
+    snapshot: RepositorySnapshot,
+) -> Dict[str, List[str]]:
     layers = {"domain": [], "data": [], "ui": []}
     for common_path in common_main_paths:
-        root = project_root / common_path
+        root = str(project_root / common_path)
         for layer in layers:
-            for path in root.rglob(layer):
-                if path.is_dir():
-                    layers[layer].append(str(path.relative_to(project_root)))
+            for path in snapshot.find_dirs(root, layer):
+                layers[layer].append(os.path.relpath(path, project_root))
     for layer in layers:
         layers[layer] = sorted(set(layers[layer]))[:MAX_LIST_ITEMS]
     return layers
-def extract_gradle_dependencies(text: str) -> List[str]:
-    deps = []
-    pattern = re.compile(r"^\s*(implementation|api|kapt|ksp)\s*\((.+)\)\s*(?://.*)?$", re.MULTILINE)
-    for match in pattern.findall(text):
-        arg = match[1].strip()
-        if (arg.startswith('"') and arg.endswith('"')) or (arg.startswith("'") and arg.endswith("'")):
-            deps.append(arg[1:-1])
-        else:
-            deps.append(arg)
-    return deps
-def classify_dependencies(deps: List[str]) -> Dict[str, List[str]]:
-    buckets = {
-        "di": [],
-        "network": [],
-        "db": [],
-        "serialization": [],
-        "async": [],
-        "navigation": [],
-        "logging": [],
-        "analytics": [],
-        "testing": [],
-        "other": [],
-    }
-    for dep in deps:
-        lowered = dep.lower()
-        if "koin" in lowered or "dagger" in lowered or "hilt" in lowered:
-            buckets["di"].append(dep)
-        elif "ktor" in lowered or "retrofit" in lowered or "okhttp" in lowered:
-            buckets["network"].append(dep)
-        elif "room" in lowered or "sqldelight" in lowered or "datastore" in lowered:
-            buckets["db"].append(dep)
-        elif "serialization" in lowered or "moshi" in lowered or "gson" in lowered:
-            buckets["serialization"].append(dep)
-        elif "coroutines" in lowered or "rxjava" in lowered:
-            buckets["async"].append(dep)
-        elif "navigation" in lowered:
-            buckets["navigation"].append(dep)
-        elif "timber" in lowered or "logger" in lowered:
-            buckets["logging"].append(dep)
-        elif "firebase" in lowered or "analytics" in lowered or "crashlytics" in lowered:
-            buckets["analytics"].append(dep)
-        elif "junit" in lowered or "kotest" in lowered or "mock" in lowered or "espresso" in lowered:
-            buckets["testing"].append(dep)
-        else:
-            buckets["other"].append(dep)
-    return buckets
-def collect_compose_routes(kotlin_files: Iterable[Path]) -> List[str]:
-    routes = set()
-    for file_path in kotlin_files:
-        text = read_text(file_path)
-        for match in COMPOSABLE_ROUTE_RE.findall(text):
-            routes.add(match)
-        for match in COMPOSABLE_ROUTE_NAMED_RE.findall(text):
-            routes.add(match)
-    return sorted(routes)
 def build_navigation_doc(
     project_root: Path,
     structure: Dict[str, List[dict]],
     flows_summary: List[str],
     flows_exists: bool,
     entry_points: Dict[str, List[str]],
-    kotlin_files: List[Path],
+    sheets: List[str],
+    files_with: Dict[str, List[str]],
     routes: List[str],
 ) -> str:
-    sheets = collect_named_symbols(kotlin_files, BOTTOM_SHEET_RE)
-    if any(MODAL_BOTTOM_SHEET_RE.search(read_text(path)) for path in kotlin_files):
-        sheets.append("ModalBottomSheet")
-        sheets = sorted(set(sheets))
-    files_with = collect_files_with_patterns(
-        kotlin_files,
-        project_root,
-        {
-            "NavGraph": NAV_GRAPH_RE,
-            "UiState": UISTATE_RE,
-            "BottomSheet": BOTTOM_SHEET_RE,
-        },
-    )
     lines = [
         "# Navegacion y pantallas",
         "",
@@ -342,15 +438,11 @@ def build_flows_doc(
     modules: List[str],
     common_main_paths: List[str],
     layer_paths: Dict[str, List[str]],
-    kotlin_files: List[Path],
+    sheets: List[str],
 ) -> str:
     nav_graphs = sorted({name for name in structure.get("screens", []) if name.endswith("NavGraph")})
     screens = structure.get("screens", [])
     ui_states = structure.get("uiStates", [])
-    sheets = collect_named_symbols(kotlin_files, BOTTOM_SHEET_RE)
-    if any(MODAL_BOTTOM_SHEET_RE.search(read_text(path)) for path in kotlin_files):
-        sheets.append("ModalBottomSheet")
-        sheets = sorted(set(sheets))
     lines = [
         "# Flujos de navegacion",
         "",
@@ -455,40 +547,54 @@ def build_architecture_doc(data: Dict[str, str]) -> str:
         "{{architecture_diagram}}"
     )
     return fill_template(default_template, data).rstrip() + "\n"
-def main() -> int:
-    project_root = Path.cwd().resolve()
-    docs_dir = project_root / "docs"
-    docs_dir.mkdir(exist_ok=True)
-    skill_root = Path(__file__).parent.resolve()
-    architecture_source = skill_root / "assets" / "architecture.md"
-    agents_source = skill_root / "assets" / "AGENTS.md"
-    kotlin_files = [Path(path) for path in iter_kotlin_files(str(project_root))]
-    structure = collect_structure(str(project_root))
-    entry_points = find_entry_points(kotlin_files, project_root)
-    modules = detect_modules(project_root)
-    common_main_paths = find_common_main(project_root, modules)
-    layer_paths = find_layer_paths(project_root, common_main_paths)
-    viewmodels = collect_named_symbols(kotlin_files, VIEWMODEL_RE)
+def find_gradle_files(project_root: Path, modules: List[str], snapshot: RepositorySnapshot) -> List[Path]:
     gradle_files = []
     for name in ["build.gradle.kts", "build.gradle"]:
         root_path = project_root / name
-        if root_path.exists():
+        if snapshot.has_file(str(root_path)):
             gradle_files.append(root_path)
     for module in modules:
         for name in ["build.gradle.kts", "build.gradle"]:
             module_path = project_root / module / name
-            if module_path.exists():
+            if snapshot.has_file(str(module_path)):
                 gradle_files.append(module_path)
+    return gradle_files
+def collect_project_facts(
+    project_root: Path,
+    scan: List[Dict[str, object]],
+    structure: Dict[str, List[dict]],
+    snapshot: RepositorySnapshot,
+) -> Dict[str, object]:
+    modules = detect_modules(project_root, snapshot)
+    common_main_paths = find_common_main(project_root, modules, snapshot)
     deps = []
-    for path in gradle_files:
+    for path in find_gradle_files(project_root, modules, snapshot):
         deps.extend(extract_gradle_dependencies(read_text(path)))
-    deps = sorted(set(deps))
-    deps_bucket = classify_dependencies(deps)
-    flows_path = docs_dir / "flows.md"
+    flows_path = project_root / "docs" / "flows.md"
     flows_exists = flows_path.exists()
     flows_text = read_text(flows_path) if flows_exists else ""
-    flows_summary = summarize_flows(flows_text)
-    routes = collect_compose_routes(kotlin_files)
+    return {
+        "structure": structure,
+        "entry_points": find_entry_points(scan),
+        "modules": modules,
+        "common_main_paths": common_main_paths,
+        "layer_paths": find_layer_paths(project_root, common_main_paths, snapshot),
+        "viewmodels": collect_named_symbols(scan, "viewModels"),
+        "routes": collect_named_symbols(scan, "routes"),
+        "sheets": collect_bottom_sheets(scan),
+        "files_with": collect_files_with_patterns(scan),
+        "deps_bucket": classify_dependencies(sorted(set(deps)), DEPENDENCY_CATEGORIES),
+        "flows_exists": flows_exists,
+        "flows_summary": summarize_flows(flows_text),
+    }
+def build_architecture_data(facts: Dict[str, object]) -> Dict[str, str]:
+    entry_points = facts["entry_points"]
+    modules = facts["modules"]
+    common_main_paths = facts["common_main_paths"]
+    layer_paths = facts["layer_paths"]
+    viewmodels = facts["viewmodels"]
+    routes = facts["routes"]
+    deps_bucket = facts["deps_bucket"]
     entry_points_block = []
     if entry_points["android"]:
         entry_points_block.append("- Android: " + ", ".join(entry_points["android"]))
@@ -545,39 +651,9 @@ def main() -> int:
         "dependencies": deps_block,
         "architecture_diagram": diagram,
     }
-    navigation_doc = build_navigation_doc(
-        project_root,
-        structure,
-        flows_summary,
-        flows_exists,
-        entry_points,
-        kotlin_files,
-        routes,
-    )
-    overview_doc = build_overview_doc(
-        project_root,
-        structure,
-        flows_exists,
-        entry_points,
-        modules,
-        common_main_paths,
-        layer_paths,
-    )
-    flows_doc = build_flows_doc(
-        project_root,
-        structure,
-        entry_points,
-        modules,
-        common_main_paths,
-        layer_paths,
-        kotlin_files,
-    )
-    readme_doc = build_readme_doc(
-        project_root,
-        modules,
-        entry_points,
-        common_main_paths,
-    )
+    return architecture_data
+def render_architecture_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    architecture_source = Path(__file__).parent.resolve() / "assets" / "architecture.md"
     architecture_template = load_template_with_fallback(
         architecture_source,
         (
@@ -591,7 +667,9 @@ def main() -> int:
             "{{architecture_diagram}}"
         ),
     )
-    architecture_doc = fill_template(architecture_template, architecture_data)
+    return fill_template(architecture_template, build_architecture_data(facts)).rstrip() + "\n"
+def render_agents_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    agents_source = Path(__file__).parent.resolve() / "assets" / "AGENTS.md"
     agents_template = load_template_with_fallback(
         agents_source,
         (
@@ -606,22 +684,166 @@ def main() -> int:
             "- Shared tests in commonTest.\n"
         ),
     )
-    agents_doc = fill_template(agents_template, {"modules": architecture_data["modules"]})
-    (docs_dir / "architecture.md").write_text(architecture_doc.rstrip() + "\n", encoding="utf-8")
-    (docs_dir / "navigation.md").write_text(navigation_doc, encoding="utf-8")
-    (docs_dir / "overview.md").write_text(overview_doc, encoding="utf-8")
-    (docs_dir / "flows.md").write_text(flows_doc, encoding="utf-8")
-    (project_root / "README.md").write_text(readme_doc.rstrip() + "\n", encoding="utf-8")
-    (project_root / "AGENTS.md").write_text(agents_doc.rstrip() + "\n", encoding="utf-8")
+    modules = facts["modules"]
+    modules_block = "- " + "\n- ".join(modules) if modules else "- No se detectaron modulos."
+    return fill_template(agents_template, {"modules": modules_block}).rstrip() + "\n"
+def render_navigation_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    return build_navigation_doc(
+        project_root,
+        facts["structure"],
+        facts["flows_summary"],
+        facts["flows_exists"],
+        facts["entry_points"],
+        facts["sheets"],
+        facts["files_with"],
+        facts["routes"],
+    )
+def render_overview_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    return build_overview_doc(
+        project_root,
+        facts["structure"],
+        facts["flows_exists"],
+        facts["entry_points"],
+        facts["modules"],
+        facts["common_main_paths"],
+        facts["layer_paths"],
+    )
+def render_flows_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    return build_flows_doc(
+        project_root,
+        facts["structure"],
+        facts["entry_points"],
+        facts["modules"],
+        facts["common_main_paths"],
+        facts["layer_paths"],
+        facts["sheets"],
+    )
+def render_readme_doc(project_root: Path, facts: Dict[str, object]) -> str:
+    return build_readme_doc(
+        project_root,
+        facts["modules"],
+        facts["entry_points"],
+        facts["common_main_paths"],
+    ).rstrip() + "\n"
+DOCUMENTS = {
+    "docs/architecture.md": (
+        ("modules", "entry_points", "common_main_paths", "layer_paths", "viewmodels", "routes", "deps_bucket"),
+        render_architecture_doc,
+    ),
+    "docs/navigation.md": (
+        ("structure", "flows_summary", "flows_exists", "entry_points", "sheets", "files_with", "routes"),
+        render_navigation_doc,
+    ),
+    "docs/overview.md": (
+        ("structure", "flows_exists", "entry_points", "modules", "common_main_paths", "layer_paths"),
+        render_overview_doc,
+    ),
+    "docs/flows.md": (
+        ("structure", "entry_points", "modules", "common_main_paths", "layer_paths", "sheets"),
+        render_flows_doc,
+    ),
+    "README.md": (("modules", "entry_points", "common_main_paths"), render_readme_doc),
+    "AGENTS.md": (("modules",), render_agents_doc),
+}
+def fact_key_default(value: object) -> object:
+    # Change detection only needs identity, so skip building one dict per edge.
+    if isinstance(value, NavigationEdges):
+        return [value.symbols, value.edges.tolist()]
+    return structure_json_default(value)
+def render_documents(
+    project_root: Path,
+    facts: Dict[str, object],
+    previous_keys: Optional[Dict[str, str]] = None,
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    documents = {}
+    keys = {}
+    for name, (inputs, render) in DOCUMENTS.items():
+        keys[name] = json.dumps([facts[field] for field in inputs], sort_keys=True, default=fact_key_default)
+        if previous_keys is not None and previous_keys.get(name) == keys[name]:
+            continue
+        documents[name] = render(project_root, facts)
+    return documents, keys
+def write_documents(project_root: Path, documents: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    written, unchanged = write_outputs({str(project_root / name): content for name, content in documents.items()})
+    return [os.path.relpath(path, project_root) for path in written], [os.path.relpath(path, project_root) for path in unchanged]
+def iter_watched_files(project_root: Path) -> Iterable[str]:
+    snapshot = repository_snapshot(str(project_root))
+    yield from iter_kotlin_files(str(project_root), snapshot)
+    for name in ["settings.gradle.kts", "settings.gradle"]:
+        yield str(project_root / name)
+    for path in find_gradle_files(project_root, detect_modules(project_root, snapshot), snapshot):
+        yield str(path)
+def regenerate_documents(
+    project_root: Path,
+    results: Dict[str, Dict[str, object]],
+    previous_keys: Dict[str, str],
+) -> Tuple[List[str], Dict[str, str]]:
+    scan = list(results.values())
+    structure = build_structure(record["structure"] for record in scan)
+    facts = collect_project_facts(project_root, scan, structure, repository_snapshot(str(project_root)))
+    documents, keys = render_documents(project_root, facts, previous_keys)
+    written, _ = write_documents(project_root, documents)
+    return written, keys
+def watch_project(project_root: Path, scan_options: Dict[str, Any], interval: float, debounce: float) -> int:
+    results = scan_project_files(project_root, scan_options)
+    snapshot = stat_snapshot(iter_watched_files(project_root))
+    names, keys = regenerate_documents(project_root, results, {})
+    print(f"Watching {project_root} (Ctrl+C to stop).")
+    print("Generated: " + ", ".join(names))
+    try:
+        while True:
+            changed, snapshot = wait_for_changes(
+                lambda: stat_snapshot(iter_watched_files(project_root)),
+                snapshot,
+                interval,
+                debounce,
+            )
+            kotlin_changed = [path for path in changed if path.endswith(".kt")]
+            rescan_paths(str(project_root), results, kotlin_changed, scan_kotlin_source, skip_generated=True)
+            results = {path: results[path] for path in snapshot if path in results}
+            names, keys = regenerate_documents(project_root, results, keys)
+            summary = ", ".join(names) if names else "no documents changed"
+            print(f"{len(changed)} file(s) changed -> {summary}")
+    except KeyboardInterrupt:
+        print("Watch stopped.")
+        return 0
+def generate_project_docs(
+    project_root: Path,
+    scan_options: Optional[Dict[str, Any]] = None,
+    snapshot: Optional[RepositorySnapshot] = None,
+) -> Tuple[List[str], List[str]]:
+    (project_root / "docs").mkdir(exist_ok=True)
+    snapshot = snapshot or repository_snapshot(str(project_root))
+    scan, structure = scan_project(project_root, scan_options, snapshot)
+    with profile_phase("aggregate"):
+        facts = collect_project_facts(project_root, scan, structure, snapshot)
+    with profile_phase("render"):
+        documents, _ = render_documents(project_root, facts)
+    return write_documents(project_root, documents)
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate README.md, AGENTS.md and docs/*.md for a KMP Compose project.")
+    add_scan_arguments(parser)
+    add_watch_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    project_root = Path.cwd().resolve()
+    start_profiling(args, [sys.modules[__name__], extract_structure, kotlin_lexer, gradle])
+    if args.watch:
+        (project_root / "docs").mkdir(exist_ok=True)
+        status = watch_project(project_root, scan_options_from_args(args), args.interval, args.debounce)
+        finish_profiling(args)
+        return status
+    written, unchanged = generate_project_docs(project_root, scan_options_from_args(args))
     print("Documentation generation completed successfully.")
     print(f"Project (cwd): {project_root}")
-    print("Generated / overwritten:")
-    print(" - AGENTS.md")
-    print(" - docs/architecture.md")
-    print(" - docs/navigation.md")
-    print(" - docs/overview.md")
-    print(" - docs/flows.md")
-    print(" - README.md")
+    print("Generated:")
+    for name in ["AGENTS.md", "docs/architecture.md", "docs/navigation.md", "docs/overview.md", "docs/flows.md", "README.md"]:
+        print(f" - {name}" + (" (unchanged)" if name in unchanged else ""))
+    print(format_write_summary(written, unchanged))
+    print(format_generated_summary())
+    finish_profiling(args)
     return 0
 if __name__ == "__main__":
     raise SystemExit(main())
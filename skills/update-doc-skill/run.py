@@ -1,18 +1,44 @@
 #!/usr/bin/env python3
+import argparse
 import sys
-import shutil
-import subprocess
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docscan import kotlin_lexer, structure as extract_structure
+from docscan.scan_engine import (
+    add_profile_arguments,
+    add_scan_arguments,
+    add_watch_arguments,
+    finish_profiling,
+    format_generated_summary,
+    format_write_summary,
+    profile_phase,
+    scan_options_from_args,
+    start_profiling,
+    write_outputs,
+)
+
 DEFAULT_LANG = "en"
 SUPPORTED_LANGS = {"en", "es"}
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate docs/structure.json and install documentation prompts.")
+    parser.add_argument("lang", nargs="?", default=DEFAULT_LANG, help="Prompt language (en or es).")
+    add_scan_arguments(parser)
+    add_watch_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args(sys.argv[1:])
+    start_profiling(args, [extract_structure, kotlin_lexer])
+
     # Project path is always the current working directory
     project_path = Path.cwd().resolve()
 
     # Optional language argument
-    lang = sys.argv[1] if len(sys.argv) >= 2 else DEFAULT_LANG
+    lang = args.lang
 
     if lang not in SUPPORTED_LANGS:
         print(f"Error: unsupported language '{lang}'. Supported languages: {', '.join(SUPPORTED_LANGS)}")
@@ -31,23 +57,17 @@ def main():
     skill_root = Path(__file__).parent.resolve()
 
     # 1. Run structure extractor
-    extract_script = skill_root / "extract_structure.py"
-    if not extract_script.exists():
-        print("Error: extract_structure.py not found in skill folder")
-        return 1
-
     print("Generating docs/structure.json ...")
 
-    result = subprocess.run(
-        ["python3", str(extract_script), str(project_path)],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode != 0:
-        print("Structure extraction failed:")
-        print(result.stderr)
-        return result.returncode
+    scan_options = scan_options_from_args(args)
+    snapshot = extract_structure.repository_snapshot(str(project_path))
+    try:
+        with profile_phase("extract"):
+            summaries = extract_structure.collect_summaries(str(project_path), scan_options, snapshot)
+            structure_written, structure_unchanged = extract_structure.write_structure(str(project_path), summaries)
+    except OSError as exc:
+        print(f"Structure extraction failed: {exc}")
+        return 1
 
     # 2. Copy language-specific prompts
     prompts_source_dir = skill_root / "prompts" / lang
@@ -56,21 +76,36 @@ def main():
         print(f"Error: prompt folder for language '{lang}' not found in skill")
         return 1
 
-    shutil.copy(prompts_source_dir / "flow_prompt.md",
-                prompts_target_dir / "flow_prompt.md")
-
-    shutil.copy(prompts_source_dir / "generate_flows.md",
-                prompts_target_dir / "generate_flows.md")
+    written, unchanged = write_outputs({
+        str(prompts_target_dir / name): (prompts_source_dir / name).read_bytes()
+        for name in ("flow_prompt.md", "generate_flows.md")
+    })
+    written += structure_written
+    unchanged += structure_unchanged
 
     print("Documentation preparation completed successfully.")
     print(f"Project (cwd): {project_path}")
     print(f"Language: {lang}")
-    print("Generated: docs/structure.json")
+    print("Generated: docs/structure.json, docs/structure.symbols")
     print("Installed prompts:")
     print(" - prompts/flow_prompt.md")
     print(" - prompts/generate_flows.md")
-
-    return 0
+    print(format_write_summary(written, unchanged))
+    print(format_generated_summary())
+
+    # 3. Optionally keep docs/structure.json up to date, starting from the scan above
+    status = 0
+    if args.watch:
+        status = extract_structure.watch_structure(
+            str(project_path),
+            scan_options,
+            args.interval,
+            args.debounce,
+            summaries=summaries,
+            files=snapshot,
+        )
+    finish_profiling(args)
+    return status
 
 
 if __name__ == "__main__":